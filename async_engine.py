@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Asyncio scrape engine
+Fetches every board as a coroutine on a single event loop and hands the
+responses to the JobScraper parse_* methods. Requires aiohttp.
+"""
+
+import asyncio
+import json
+from typing import List, Dict
+
+import aiohttp
+
+from json_stream import EmbeddedJsonStream
+from scraper import MISSING_ENDPOINT_STATUSES, NEXT_DATA_JOB_PATHS, NEXT_DATA_SCRIPT, STREAM_CHUNK_SIZE
+
+
+class AsyncEngine:
+    """Runs the fetch half of each board type concurrently on one event loop"""
+
+    def __init__(self, scraper):
+        """Initialize engine around a JobScraper (used for config, headers and parsing)"""
+        self.scraper = scraper
+        settings = scraper.config.get('settings', {})
+        self.max_connections = max(1, int(settings.get('max_connections', 1000)))
+        self.max_per_host = max(1, int(settings.get('max_per_host', 2)))
+        # Per connect and per read, so time spent waiting for a free per-host slot doesn't count
+        self.timeout = aiohttp.ClientTimeout(total=None, sock_connect=15, sock_read=15)
+        self.stats = {'requests': 0, 'new_connections': 0, 'reused_connections': 0}
+
+    def run(self, boards: List[Dict]) -> List[List[Dict]]:
+        """Scrape all boards, returning results in board order"""
+        results = asyncio.run(self.scrape_boards(boards))
+        self.scraper.async_connection_stats = self.stats
+        return results
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Count requests and new/reused connections like http_session does"""
+        def counter(key):
+            async def count(session, context, params):
+                self.stats[key] += 1
+            return count
+
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(counter('requests'))
+        trace.on_connection_create_end.append(counter('new_connections'))
+        trace.on_connection_reuseconn.append(counter('reused_connections'))
+        return trace
+
+    async def scrape_boards(self, boards: List[Dict]) -> List[List[Dict]]:
+        """Scrape all boards on the running event loop"""
+        connector = aiohttp.TCPConnector(limit=self.max_connections,
+                                         limit_per_host=self.max_per_host)
+        async with aiohttp.ClientSession(connector=connector, timeout=self.timeout,
+                                         headers=self.scraper.headers,
+                                         trace_configs=[self.trace_config()]) as session:
+            return await asyncio.gather(*(self.scrape_board(session, board) for board in boards))
+
+    async def scrape_board(self, session: aiohttp.ClientSession, board: Dict) -> List[Dict]:
+        """Scrape a single job board based on its type"""
+        board_type = board.get('type', 'generic').lower()
+
+        scraper_map = {
+            'generic': self.scrape_generic,
+            'greenhouse': self.scrape_greenhouse,
+            'lever': self.scrape_lever,
+            'ashby': self.scrape_ashby,
+            'nextjs': self.scrape_nextjs,
+            'api': self.scrape_api,
+        }
+
+        scraper_func = scraper_map.get(board_type, self.scrape_generic)
+        try:
+            return await scraper_func(session, board)
+        except Exception as e:
+            self.scraper.scrape_failed(board, f"Error scraping {board.get('name', 'Unknown')}: {e!r}")
+            return []
+
+    async def fetch(self, session: aiohttp.ClientSession, board: Dict, url: str,
+                    headers: Dict = None, raise_for_status: bool = False):
+        """GET a URL for a board, returning (status, body bytes, charset, headers)"""
+        entry = self.scraper.cached_response(board, url)
+        if entry is not None:
+            status, body, response_headers = entry['status'], entry['body'], entry['headers']
+            charset = 'utf-8'
+        else:
+            headers = dict(headers or {})
+            headers.update(self.scraper.conditional_headers(board, url))
+            async with session.get(url, headers=headers) as response:
+                status, body = response.status, await response.read()
+                charset, response_headers = response.charset or 'utf-8', response.headers
+            self.scraper.record_response(url, status, response_headers, body)
+
+        if raise_for_status and status >= 400:
+            raise aiohttp.ClientError(f"{status} Error for url: {url}")
+        return status, body, charset, response_headers
+
+    async def run_blocking(self, func, *args):
+        """Run CPU-bound work (parsing) in a worker thread, so other boards keep downloading"""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def parse_once(self, board: Dict, url: str, headers, body: bytes, parse) -> List[Dict]:
+        """JobScraper.parse_once, off the event loop"""
+        return await self.run_blocking(self.scraper.parse_once, board, url, headers, body, parse)
+
+    async def scrape_generic(self, session, board: Dict) -> List[Dict]:
+        """Scrape generic job boards using custom selectors"""
+        try:
+            status, body, _, headers = await self.fetch(session, board, board['url'],
+                                                        raise_for_status=True)
+            if status == 304:
+                return self.scraper.reuse_jobs(board)
+            jobs = await self.parse_once(board, board['url'], headers, body,
+                                         lambda: self.scraper.parse_generic(board, body))
+            return jobs
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.scraper.scrape_failed(board, f"Error scraping {board['name']}: {e!r}")
+            return []
+
+    async def scrape_greenhouse(self, session, board: Dict) -> List[Dict]:
+        """Scrape Greenhouse job boards"""
+        if self.scraper.choose_endpoint(board) == 'json':
+            try:
+                api_url = board['url'].rstrip('/') + '/embed/jobs.json'
+                status, body, _, headers = await self.fetch(session, board, api_url)
+                if status == 304:
+                    return self.scraper.reuse_jobs(board)
+                if status == 200:
+                    jobs = await self.parse_once(board, api_url, headers, body,
+                                                 lambda: self.scraper.parse_greenhouse(board, json.loads(body)))
+                    self.scraper.remember_endpoint(board, 'json')
+                    return jobs
+                if status in MISSING_ENDPOINT_STATUSES:
+                    self.scraper.remember_endpoint(board, 'html')
+            except Exception as e:
+                print(f"Error scraping Greenhouse board {board['name']}: {e!r}")
+                if isinstance(e, ValueError):
+                    self.scraper.remember_endpoint(board, 'html')
+
+        # Fallback to HTML scraping
+        try:
+            status, body, _, headers = await self.fetch(session, board, board['url'],
+                                                        raise_for_status=True)
+            if status == 304:
+                return self.scraper.reuse_jobs(board)
+            jobs = await self.parse_once(board, board['url'], headers, body,
+                                         lambda: self.scraper.parse_greenhouse_html(board, body))
+            return jobs
+        except Exception as e:
+            self.scraper.scrape_failed(board, f"Error scraping Greenhouse HTML for {board['name']}: {e!r}")
+            return []
+
+    async def scrape_lever(self, session, board: Dict) -> List[Dict]:
+        """Scrape Lever job boards with JSON API and HTML fallback"""
+        try:
+            if self.scraper.choose_endpoint(board) == 'json':
+                api_url = board['url'].rstrip('/') + '?mode=json'
+                status, body, _, headers = await self.fetch(session, board, api_url)
+                if status == 304:
+                    return self.scraper.reuse_jobs(board)
+                if status == 200:
+                    try:
+                        jobs = await self.parse_once(board, api_url, headers, body,
+                                                     lambda: self.scraper.parse_lever(board, json.loads(body)))
+                        self.scraper.remember_endpoint(board, 'json')
+                        return jobs
+                    except ValueError:
+                        print(f"  Lever JSON API not available for {board['name']}, using HTML fallback")
+                        self.scraper.remember_endpoint(board, 'html')
+                elif status in MISSING_ENDPOINT_STATUSES:
+                    self.scraper.remember_endpoint(board, 'html')
+
+            html_url = board['url'].rstrip('/')
+            status, body, charset, headers = await self.fetch(session, board, html_url,
+                                                              raise_for_status=True)
+            if status == 304:
+                return self.scraper.reuse_jobs(board)
+            if status == 200:
+                text = body.decode(charset, errors='replace')
+                jobs = await self.parse_once(board, html_url, headers, body,
+                                             lambda: self.scraper.parse_lever_html(board, text))
+                return jobs
+
+        except Exception as e:
+            self.scraper.scrape_failed(board, f"Error scraping Lever board {board['name']}: {e!r}")
+
+        return []
+
+    async def scrape_api(self, session, board: Dict) -> List[Dict]:
+        """Scrape jobs from custom API endpoints"""
+        try:
+            if board.get('stream') and self.scraper.cache is None:
+                return await self.stream_api(session, board)
+
+            status, body, _, headers = await self.fetch(session, board, board['url'],
+                                                        headers=self.scraper.api_headers(board),
+                                                        raise_for_status=True)
+            if status == 304:
+                return self.scraper.reuse_jobs(board)
+            jobs = await self.parse_once(board, board['url'], headers, body,
+                                         lambda: self.scraper.parse_api(board, json.loads(body)))
+            return jobs
+        except Exception as e:
+            self.scraper.scrape_failed(board, f"Error scraping API {board['name']}: {e!r}")
+            return []
+
+    async def stream_api(self, session, board: Dict) -> List[Dict]:
+        """Scrape a custom API board while it downloads (see JobScraper.stream_api)"""
+        jobs = []
+        paginated = bool(board.get('next_cursor'))
+        max_pages = max(1, int(board.get('max_pages', 100)))
+        url, seen, validators = board['url'], set(), {}
+        while url and url not in seen and len(seen) < max_pages:
+            seen.add(url)
+            headers = self.scraper.api_headers(board)
+            if not paginated:
+                headers.update(self.scraper.conditional_headers(board, url))
+            stream = self.scraper.api_stream(board)
+            async with session.get(url, headers=headers) as response:
+                if response.status >= 400:
+                    raise aiohttp.ClientError(f"{response.status} Error for url: {url}")
+                if response.status == 304:
+                    return self.scraper.reuse_jobs(board)
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    jobs.extend(self.scraper.api_jobs(board, stream.feed(chunk)))
+                    if stream.done:
+                        break
+                jobs.extend(self.scraper.api_jobs(board, stream.close()))
+            if not paginated:
+                validators = response.headers
+            url = self.scraper.next_page_url(board, url, stream.captured)
+
+        self.scraper.remember_jobs(board, board['url'], validators, jobs)
+        return jobs
+
+    async def scrape_nextjs(self, session, board: Dict) -> List[Dict]:
+        """Scrape Next.js job boards with embedded __NEXT_DATA__"""
+        try:
+            if board.get('stream') and self.scraper.cache is None:
+                return await self.stream_nextjs(session, board)
+
+            status, body, charset, headers = await self.fetch(session, board, board['url'],
+                                                              raise_for_status=True)
+            if status == 304:
+                return self.scraper.reuse_jobs(board)
+            next_data = await self.run_blocking(self.scraper.extract_next_data,
+                                                body.decode(charset, errors='replace'))
+            jobs = await self.parse_once(board, board['url'], headers, (next_data or '').encode(),
+                                         lambda: self.scraper.parse_next_data(board, next_data))
+            return jobs
+        except Exception as e:
+            self.scraper.scrape_failed(board, f"Error scraping Next.js board {board['name']}: {e!r}")
+            return []
+
+    async def stream_nextjs(self, session, board: Dict) -> List[Dict]:
+        """Scrape a Next.js board while it downloads (see JobScraper.stream_nextjs)"""
+        jobs = []
+        stream = EmbeddedJsonStream(NEXT_DATA_JOB_PATHS, NEXT_DATA_SCRIPT)
+        headers = self.scraper.conditional_headers(board, board['url'])
+        async with session.get(board['url'], headers=headers) as response:
+            if response.status >= 400:
+                raise aiohttp.ClientError(f"{response.status} Error for url: {board['url']}")
+            if response.status == 304:
+                return self.scraper.reuse_jobs(board)
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                jobs.extend(self.scraper.nextjs_jobs(board, stream.feed(chunk)))
+                if stream.done:
+                    break
+            jobs.extend(self.scraper.nextjs_jobs(board, stream.close()))
+
+        if not stream.started:
+            print(f"Could not find Next.js data in {board['name']}")
+        self.scraper.remember_jobs(board, board['url'], response.headers, jobs)
+        return jobs
+
+    async def scrape_ashby(self, session, board: Dict) -> List[Dict]:
+        """Scrape Ashby job boards"""
+        try:
+            status, body, _, headers = await self.fetch(session, board, board['url'],
+                                                        raise_for_status=True)
+            if status == 304:
+                return self.scraper.reuse_jobs(board)
+            jobs = await self.parse_once(board, board['url'], headers, body,
+                                         lambda: self.scraper.parse_ashby(board, body))
+            return jobs
+        except Exception as e:
+            self.scraper.scrape_failed(board, f"Error scraping Ashby board {board['name']}: {e!r}")
+            return []
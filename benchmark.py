@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the scraper's hot paths
+Runs on synthetic pages, so no network access or config.json is needed.
+
+    python3 benchmark.py parsers
+    python3 benchmark.py ashby
+    python3 benchmark.py selectors
+    python3 benchmark.py scoped
+    python3 benchmark.py json
+    python3 benchmark.py dedupe
+    python3 benchmark.py records
+    python3 benchmark.py snapshot
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+import exports
+import json_codec
+from html_backends import available_backends, parse_html
+from job_store import JsonJobStore
+from scraper import JobScraper
+
+
+def best_time(func: Callable, repeat: int = 5) -> float:
+    """Fastest of several runs of func, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def comparable(jobs: List[Dict]) -> List[Dict]:
+    """Jobs without the fields that change on every parse"""
+    return [{k: v for k, v in job.items() if k != 'scraped_at'} for job in jobs]
+
+
+def page_chrome(size_kb: int) -> tuple:
+    """Navigation/footer/script filler of roughly size_kb, as (header, footer)"""
+    nav = ''.join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(size_kb * 4))
+    script = '<script>var tracking = "' + 'x' * (size_kb * 256) + '";</script>'
+    footer = ''.join(f'<p class="legal">Footer paragraph {i} with some text.</p>' for i in range(size_kb * 4))
+    return (f'<html><head><title>Careers</title>{script}</head><body><nav><ul>{nav}</ul></nav>',
+            f'<footer>{footer}</footer></body></html>')
+
+
+def generic_page(jobs: int, size_kb: int) -> bytes:
+    """Generic careers page with jobs div.job containers"""
+    header, footer = page_chrome(size_kb)
+    listings = ''.join(
+        f'<div class="job"><h2 class="title">Engineer {i}</h2><span class="location">City {i % 20}</span>'
+        f'<p class="description">Work on things {i}.</p><a href="/jobs/{i}">Apply</a>'
+        f'<time>2026-10-{i % 28 + 1:02d}</time></div>'
+        for i in range(jobs))
+    return f'{header}<main>{listings}</main>{footer}'.encode()
+
+
+def greenhouse_page(jobs: int, size_kb: int) -> bytes:
+    """Classic Greenhouse board page"""
+    header, footer = page_chrome(size_kb)
+    openings = ''.join(f'<div class="opening"><a href="/acme/jobs/{i}">Engineer {i}</a></div>'
+                       for i in range(jobs))
+    return f'{header}<section class="level-0"><h3>Engineering</h3>{openings}</section>{footer}'.encode()
+
+
+def lever_page(jobs: int, size_kb: int) -> bytes:
+    """Lever board page"""
+    header, footer = page_chrome(size_kb)
+    postings = ''.join(
+        f'<div class="posting"><a class="posting-title" href="https://jobs.lever.co/acme/{i}">'
+        f'<h5>Engineer {i}</h5><span class="location">City {i % 20}</span>'
+        f'<span class="department">Engineering</span></a></div>'
+        for i in range(jobs))
+    return f'{header}{postings}{footer}'.encode()
+
+
+def ashby_page(jobs: int, size_kb: int) -> bytes:
+    """Ashby board page with window.__appData"""
+    header, footer = page_chrome(size_kb)
+    app_data = {'jobBoard': {'jobPostings': [
+        {'id': f'job-{i}', 'title': f'Engineer {i}', 'locationName': f'City {i % 20}', 'isListed': True,
+         'descriptionPlain': 'Work on things. ' * 40, 'publishedDate': '2026-10-01',
+         'employmentType': 'FullTime', 'departmentName': 'Engineering'}
+        for i in range(jobs)]}}
+    script = f'<script>window.__appData = {json.dumps(app_data)};</script>'
+    return f'{header}{script}{footer}'.encode()
+
+
+def quiet_scraper() -> JobScraper:
+    """JobScraper without the missing config.json warning"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return JobScraper()
+
+
+def bench_parsers(args):
+    """Time each HTML parser backend on every HTML board type"""
+    scraper = quiet_scraper()
+    board_types = [
+        ('generic', generic_page, 'parse_generic',
+         {'selectors': {'job_container': 'div.job', 'title': 'h2.title', 'location': 'span.location',
+                        'description': 'p.description', 'link': 'a', 'date_posted': 'time'}}),
+        ('greenhouse (HTML)', greenhouse_page, 'parse_greenhouse_html', {}),
+        ('lever (HTML)', lever_page, 'parse_lever_html', {}),
+    ]
+
+    print(f"{args.jobs} jobs per page, ~{args.size_kb} KB of page chrome, best of {args.repeat}\n")
+    print(f"{'board type':<20}{'backend':<14}{'page KB':>8}{'ms':>10}  identical jobs")
+    for label, make_page, method, extra in board_types:
+        page = make_page(args.jobs, args.size_kb)
+        baseline = None
+        for backend in available_backends():
+            board = dict(extra, name='Acme', url='https://example.com/careers', parser=backend)
+            parse = getattr(scraper, method)
+            content = page.decode() if method == 'parse_lever_html' else page
+            jobs = comparable(parse(board, content))
+            baseline = jobs if baseline is None else baseline
+            ms = best_time(lambda: parse(board, content), args.repeat)
+            print(f"{label:<20}{backend:<14}{len(page) // 1024:>8}{ms:>10.1f}  "
+                  f"{'yes' if jobs == baseline else 'NO'} ({len(jobs)} jobs)")
+
+    print("\nLever HTML pages are parsed with BeautifulSoup; the selectolax backend uses lxml for them.")
+
+
+def soup_app_data(content: bytes) -> Optional[Dict]:
+    """window.__appData the way parse_ashby used to find it (DOM + regex), for comparison"""
+    soup = BeautifulSoup(content, 'html.parser')
+    for script in soup.find_all('script'):
+        if script.string and 'window.__appData' in script.string:
+            match = re.search(r'window\.__appData\s*=\s*(\{.*?\});', script.string, re.DOTALL)
+            if match:
+                return json.loads(match.group(1))
+    return None
+
+
+def bench_ashby(args):
+    """Time window.__appData extraction: DOM + regex versus the raw byte scan"""
+    scraper = quiet_scraper()
+    page = ashby_page(args.jobs, args.size_kb)
+    print(f"Ashby page: {len(page) / 1024 / 1024:.1f} MB, {args.jobs} postings, best of {args.repeat}\n")
+
+    expected = soup_app_data(page)
+    for label, extract in [('BeautifulSoup + regex', soup_app_data),
+                           ('raw byte scan', scraper.extract_app_data)]:
+        ms = best_time(lambda: extract(page), args.repeat)
+        print(f"{label:<24}{ms:>10.1f} ms  {'identical' if extract(page) == expected else 'DIFFERENT'}")
+
+
+GENERIC_SELECTORS = {'job_container': 'div.job', 'title': 'h2.title', 'location': 'span.location',
+                     'description': 'p.description', 'link': 'a', 'date_posted': 'time'}
+
+
+def string_selector_fields(containers: List, selectors: Dict) -> List[List]:
+    """Per-container field lookups with selector strings, the way parse_generic used to"""
+    fields = ('title', 'location', 'description', 'link', 'date_posted')
+    return [[container.select_one(selectors[name]) for name in fields] for container in containers]
+
+
+def compiled_selector_fields(containers: List, selectors: Dict) -> List[List]:
+    """Per-container field lookups with precompiled selectors"""
+    fields = [selectors[name] for name in ('title', 'location', 'description', 'link', 'date_posted')]
+    return [[selector.select_one(container) for selector in fields] for container in containers]
+
+
+def element_texts(rows: List[List]) -> List[List]:
+    """Text of each matched element (None where nothing matched)"""
+    return [[elem.text if elem else None for elem in row] for row in rows]
+
+
+def bench_selectors(args):
+    """Per-container cost of selector strings versus precompiled selectors"""
+    scraper = quiet_scraper()
+    board = {'name': 'Acme', 'url': 'https://example.com/careers', 'selectors': GENERIC_SELECTORS}
+    compiled = scraper.generic_selectors(board)
+    page = generic_page(args.jobs, 50)
+    print(f"{args.jobs} containers, 5 field selectors each, best of {args.repeat}\n")
+    print(f"{'backend':<14}{'strings us/container':>22}{'compiled us/container':>23}  identical")
+
+    for backend in available_backends():
+        soup = parse_html(page, backend)
+        containers = compiled['job_container'].select(soup)
+        same = (element_texts(string_selector_fields(containers, GENERIC_SELECTORS))
+                == element_texts(compiled_selector_fields(containers, compiled)))
+        strings_ms = best_time(lambda: string_selector_fields(containers, GENERIC_SELECTORS), args.repeat)
+        compiled_ms = best_time(lambda: compiled_selector_fields(containers, compiled), args.repeat)
+        print(f"{backend:<14}{strings_ms * 1000 / len(containers):>22.1f}"
+              f"{compiled_ms * 1000 / len(containers):>23.1f}  {'yes' if same else 'NO'}")
+
+
+def peak_memory(func: Callable) -> float:
+    """Peak Python memory allocated while running func, in MB"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def bench_scoped(args):
+    """Full versus scoped (SoupStrainer) parsing of a large generic page"""
+    scraper = quiet_scraper()
+    page = generic_page(args.jobs, args.size_kb)
+    print(f"{args.jobs} jobs, {len(page) // 1024} KB page, best of {args.repeat}\n")
+    print(f"{'backend':<14}{'mode':<8}{'ms':>10}{'peak MB':>10}  identical jobs")
+
+    for backend in [backend for backend in available_backends() if backend != 'selectolax']:
+        baseline = None
+        for mode, scoped in [('full', False), ('scoped', True)]:
+            board = {'name': 'Acme', 'url': 'https://example.com/careers', 'parser': backend,
+                     'scoped_parse': scoped, 'selectors': GENERIC_SELECTORS}
+            jobs = comparable(scraper.parse_generic(board, page))
+            baseline = jobs if baseline is None else baseline
+            ms = best_time(lambda: scraper.parse_generic(board, page), args.repeat)
+            mb = peak_memory(lambda: scraper.parse_generic(board, page))
+            print(f"{backend:<14}{mode:<8}{ms:>10.1f}{mb:>10.1f}  "
+                  f"{'yes' if jobs == baseline else 'NO'} ({len(jobs)} jobs)")
+
+
+def stored_jobs(count: int) -> List[Dict]:
+    """Synthetic jobs.json contents"""
+    return [{
+        'title': f'Senior Software Engineer {i}',
+        'company': f'Company {i % 500}',
+        'location': f'City {i % 50}, Country',
+        'description': 'Build and operate services used by millions of people. ' * 3,
+        'url': f'https://jobs.example.com/company-{i % 500}/{i}',
+        'date_posted': '2026-10-01',
+        'source': f'Company {i % 500}',
+        'scraped_at': f'2026-10-{i % 28 + 1:02d}T09:00:00.{i % 1000000:06d}',
+        'id': f'{i:032x}',
+    } for i in range(count)]
+
+
+def stdlib_save(jobs: List[Dict], path: str, **options):
+    """Write jobs with the standard library json module"""
+    with open(path, 'w') as f:
+        json.dump(jobs, f, **options)
+
+
+def stdlib_load(path: str) -> List[Dict]:
+    """Read jobs with the standard library json module"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def bench_json(args):
+    """Load/save time of jobs.json: indented stdlib json versus the json_codec module"""
+    codecs = [('json, indent=2', lambda jobs, path: stdlib_save(jobs, path, indent=2), stdlib_load),
+              (f'json_codec ({json_codec.BACKEND})', json_codec.dump, json_codec.load)]
+    if json_codec.BACKEND != 'json':
+        codecs.insert(1, ('json, compact', lambda jobs, path: stdlib_save(jobs, path, separators=(',', ':')),
+                          stdlib_load))
+
+    print(f"best of {args.repeat}\n")
+    print(f"{'jobs':>9}  {'codec':<22}{'MB':>8}{'save ms':>11}{'load ms':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'jobs.json')
+        for count in args.sizes:
+            jobs = stored_jobs(count)
+            for label, save, load in codecs:
+                save_ms = best_time(lambda: save(jobs, path), args.repeat)
+                load_ms = best_time(lambda: load(path), args.repeat)
+                same = load(path) == jobs
+                print(f"{count:>9}  {label:<22}{os.path.getsize(path) / 1024 / 1024:>8.1f}"
+                      f"{save_ms:>11.0f}{load_ms:>11.0f}{'' if same else '  ROUND TRIP FAILED'}")
+            del jobs
+
+
+def loaded_known_ids(path: str, ids: List[str]) -> set:
+    """Which of ids are in the jobs file, by loading every stored job"""
+    store = JsonJobStore(path)
+    store.all_jobs()
+    return store.known_ids(ids)
+
+
+def indexed_known_ids(path: str, ids: List[str]) -> set:
+    """Which of ids are in the jobs file, from its ID index"""
+    store = JsonJobStore(path)
+    try:
+        return store.known_ids(ids)
+    finally:
+        store.close()
+
+
+def bench_dedupe(args):
+    """Cost of finding a run's new jobs: loading jobs.json versus its ID index"""
+    print(f"{args.new} scraped jobs, half of them new, best of {args.repeat}\n")
+    print(f"{'stored':>9}  {'method':<10}{'ms':>10}{'peak MB':>10}  same result")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'jobs.json')
+        for count in args.sizes:
+            store = JsonJobStore(path)
+            store.add(stored_jobs(count))
+            store.save()
+            store.close()
+            del store
+            ids = [f'{i:032x}' for i in range(count - args.new // 2, count + args.new - args.new // 2)]
+
+            expected = loaded_known_ids(path, ids)
+            for label, known_ids in [('load', loaded_known_ids), ('id index', indexed_known_ids)]:
+                ms = best_time(lambda: known_ids(path, ids), args.repeat)
+                mb = peak_memory(lambda: known_ids(path, ids))
+                same = known_ids(path, ids) == expected
+                print(f"{count:>9}  {label:<10}{ms:>10.2f}{mb:>10.1f}  {'yes' if same else 'NO'}")
+
+
+def retained_memory(func: Callable) -> float:
+    """Python memory still allocated for what func returns, in MB"""
+    tracemalloc.start()
+    try:
+        result = func()
+        retained = tracemalloc.get_traced_memory()[0]
+        del result
+        return retained / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def bench_records(args):
+    """Memory held by stored jobs as dicts versus job_record.Job records"""
+    print(f"{'jobs':>9}  {'as':<6}{'MB':>9}{'bytes/job':>11}  lossless")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'jobs.json')
+        for count in args.sizes:
+            json_codec.dump(stored_jobs(count), path)
+            dict_mb = retained_memory(lambda: json_codec.load(path))
+            job_mb = retained_memory(lambda: JsonJobStore(path).all_jobs())
+            same = [job.to_dict() for job in JsonJobStore(path).all_jobs()] == json_codec.load(path)
+            for label, mb in [('dict', dict_mb), ('Job', job_mb)]:
+                print(f"{count:>9}  {label:<6}{mb:>9.1f}{mb * 1024 * 1024 / count:>11.0f}  {'yes' if same else 'NO'}")
+
+
+def csv_weekly_counts(path: str) -> Counter:
+    """Jobs per (board, ISO week scraped) from jobs.csv, row by row"""
+    with open(path, newline='', encoding='utf-8') as f:
+        return Counter((row['Company'], datetime.fromisoformat(row['Scraped At']).isocalendar()[:2])
+                       for row in csv.DictReader(f))
+
+
+def parquet_weekly_counts(path: str) -> int:
+    """Number of (board, week) groups in jobs.parquet, counted with Arrow compute"""
+    import pyarrow.compute as compute
+    table = exports.pyarrow.parquet.read_table(path, columns=['source', 'scraped_at'])
+    table = table.append_column('week', compute.floor_temporal(table['scraped_at'], unit='week'))
+    return table.group_by(['source', 'week']).aggregate([('scraped_at', 'count')]).num_rows
+
+
+def npz_weekly_counts(path: str) -> int:
+    """Number of (board, week) groups in jobs.npz, counted with NumPy"""
+    numpy = exports.numpy
+    arrays = numpy.load(path)
+    # Days since 1970-01-01, a Thursday, shifted so weeks start on Monday
+    weeks = (arrays['scraped_at'].astype('datetime64[D]').astype(numpy.int64) + 3) // 7
+    keys = arrays['source_codes'].astype(numpy.int64) << 32 | (weeks - weeks.min())
+    return len(numpy.unique(keys))
+
+
+def bench_snapshot(args):
+    """Loading jobs per board and week from jobs.csv versus the columnar snapshot"""
+    print(f"{'jobs':>9}  {'from':<10}{'MB':>8}{'export ms':>11}{'load + group ms':>17}{'groups':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.sizes:
+            path = os.path.join(directory, 'jobs.json')
+            json_codec.dump(stored_jobs(count), path)
+            store = JsonJobStore(path)
+            store.all_jobs()
+            sinks = [exports.CsvSink(os.path.join(directory, 'jobs.csv'))]
+            if exports.pyarrow is not None:
+                sinks.append(exports.ParquetSink(os.path.join(directory, 'jobs.parquet')))
+            if exports.numpy is not None:
+                sinks.append(exports.NpzSink(os.path.join(directory, 'jobs.npz')))
+            for sink in sinks:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    export_ms = best_time(lambda: exports.export_jobs([sink], store), args.repeat)
+                group = {exports.CsvSink: lambda: len(csv_weekly_counts(sink.path)),
+                         exports.ParquetSink: lambda: parquet_weekly_counts(sink.path),
+                         exports.NpzSink: lambda: npz_weekly_counts(sink.path)}[type(sink)]
+                groups = group()
+                load_ms = best_time(group, args.repeat)
+                mb = os.path.getsize(sink.path) / 1024 / 1024
+                print(f"{count:>9}  {sink.LABEL:<10}{mb:>8.1f}{export_ms:>11.0f}{load_ms:>17.0f}{groups:>8}")
+    if exports.pyarrow is None and exports.numpy is None:
+        print("(install pyarrow or numpy to compare the columnar snapshot)")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark the scraper on synthetic pages')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    parsers = subparsers.add_parser('parsers', help='HTML parser backends per board type')
+    parsers.add_argument('--jobs', type=int, default=300, help='jobs per page')
+    parsers.add_argument('--size-kb', type=int, default=500, help='approximate size of the non-job markup')
+    parsers.add_argument('--repeat', type=int, default=5, help='runs per measurement (best is reported)')
+    parsers.set_defaults(func=bench_parsers)
+
+    ashby = subparsers.add_parser('ashby', help='window.__appData extraction on a multi-MB Ashby page')
+    ashby.add_argument('--jobs', type=int, default=3000, help='postings on the page')
+    ashby.add_argument('--size-kb', type=int, default=1000, help='approximate size of the non-job markup')
+    ashby.add_argument('--repeat', type=int, default=5, help='runs per measurement (best is reported)')
+    ashby.set_defaults(func=bench_ashby)
+
+    selectors = subparsers.add_parser('selectors', help='per-container cost of generic board selectors')
+    selectors.add_argument('--jobs', type=int, default=1000, help='job containers on the page')
+    selectors.add_argument('--repeat', type=int, default=5, help='runs per measurement (best is reported)')
+    selectors.set_defaults(func=bench_selectors)
+
+    scoped = subparsers.add_parser('scoped', help='full versus scoped parsing of a large generic page')
+    scoped.add_argument('--jobs', type=int, default=300, help='jobs per page')
+    scoped.add_argument('--size-kb', type=int, default=2000, help='approximate size of the non-job markup')
+    scoped.add_argument('--repeat', type=int, default=5, help='runs per measurement (best is reported)')
+    scoped.set_defaults(func=bench_scoped)
+
+    json_bench = subparsers.add_parser('json', help='jobs.json load/save time per JSON codec')
+    json_bench.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000],
+                            help='numbers of stored jobs')
+    json_bench.add_argument('--repeat', type=int, default=3, help='runs per measurement (best is reported)')
+    json_bench.set_defaults(func=bench_json)
+
+    dedupe = subparsers.add_parser('dedupe', help='finding new jobs by loading jobs.json versus its ID index')
+    dedupe.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help='numbers of stored jobs')
+    dedupe.add_argument('--new', type=int, default=50, help='jobs scraped in the run')
+    dedupe.add_argument('--repeat', type=int, default=3, help='runs per measurement (best is reported)')
+    dedupe.set_defaults(func=bench_dedupe)
+
+    records = subparsers.add_parser('records', help='memory held by stored jobs as dicts versus Job records')
+    records.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000],
+                         help='numbers of stored jobs')
+    records.set_defaults(func=bench_records)
+
+    snapshot = subparsers.add_parser('snapshot', help='jobs per board and week from jobs.csv versus the snapshot')
+    snapshot.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000],
+                          help='numbers of stored jobs')
+    snapshot.add_argument('--repeat', type=int, default=3, help='runs per measurement (best is reported)')
+    snapshot.set_defaults(func=bench_snapshot)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
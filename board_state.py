@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Per-board state persisted between scraper runs
+Stores, for every board URL, what the scraper learned last time (HTTP
+validators and the job list they belong to).
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List
+
+
+class BoardState:
+    """Thread-safe JSON file of per-board state, keyed by board URL"""
+
+    def __init__(self, path: str):
+        """Load state from path (missing or invalid files start empty)"""
+        self.path = path
+        self.lock = threading.Lock()
+        self.boards = self.load()
+
+    def load(self) -> Dict:
+        """Load state from disk"""
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, OSError):
+                print(f"Warning: Could not read {self.path}, starting with empty board state")
+        return {}
+
+    def get(self, board_url: str) -> Dict:
+        """Return a copy of the state stored for a board"""
+        with self.lock:
+            return dict(self.boards.get(board_url, {}))
+
+    def all_jobs(self) -> List[Dict]:
+        """The jobs stored for every board (the stored dicts, so they can be edited in place)"""
+        with self.lock:
+            return [job for board in self.boards.values() for job in board.get('jobs', [])]
+
+    def update(self, board_url: str, **fields):
+        """Set fields in a board's state"""
+        with self.lock:
+            self.boards.setdefault(board_url, {}).update(fields)
+
+    def save(self):
+        """Write state to disk atomically"""
+        with self.lock:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self.boards, f)
+            os.replace(tmp_path, self.path)
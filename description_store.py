@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Full job descriptions
+With full_descriptions on, job records keep only a description_ref and the
+full text lives in descriptions.bin: one compressed frame (zlib, or zstd
+when zstandard is installed and asked for) per description, appended as
+jobs are found. descriptions.bin.index has one fixed-size record per frame
+(ID digest, offset, length, codec), so reading a description is one seek
+and one decompress, and nothing that reads the jobs parses the text.
+"""
+
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+from id_index import id_digest
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Digest of the description_ref, then the frame's offset and length in the data file, and its codec
+RECORD = struct.Struct('<16sQIB')
+CODECS = {'zlib': 0, 'zstd': 1}
+ZLIB, ZSTD = CODECS['zlib'], CODECS['zstd']
+
+# The data file isn't rewritten for less dead space than this
+COMPACT_MIN_DEAD = 1 << 20
+
+# Open stores by path, so the web UI reads each index once
+_description_stores = {}
+
+
+class DescriptionStore:
+    """Compressed descriptions keyed by the ID of the job they were found for"""
+
+    def __init__(self, path: str, compression: str = 'zlib', level: int = 6):
+        """Store with its frames at path and its index at path + '.index'"""
+        self.path = path
+        self.index_path = path + '.index'
+        self.level = level
+        self.lock = threading.RLock()
+        self.frames = {}
+        self.inode = None
+        self.offset = 0
+
+        if compression == 'zstd' and zstandard is None:
+            print("Warning: zstandard is not installed, compressing descriptions with zlib")
+        elif compression not in CODECS:
+            print(f"Warning: Unknown description compression '{compression}', using zlib")
+        self.codec = ZSTD if compression == 'zstd' and zstandard is not None else ZLIB
+
+    def refresh(self):
+        """Read the index records appended since the last read (all of them after a compaction)"""
+        with self.lock:
+            try:
+                stat = os.stat(self.index_path)
+            except FileNotFoundError:
+                self.frames, self.inode, self.offset = {}, None, 0
+                return
+            if stat.st_ino != self.inode or stat.st_size < self.offset:
+                self.frames, self.inode, self.offset = {}, stat.st_ino, 0
+            if stat.st_size - self.offset < RECORD.size:
+                return
+
+            with open(self.index_path, 'rb') as f:
+                f.seek(self.offset)
+                data = f.read(stat.st_size - self.offset)
+            # A record cut short by an interrupted write is left for add() to drop
+            usable = len(data) - len(data) % RECORD.size
+            for digest, offset, length, codec in RECORD.iter_unpack(data[:usable]):
+                self.frames[digest] = (offset, length, codec)
+            self.offset += usable
+
+    def __len__(self) -> int:
+        """Number of stored descriptions"""
+        with self.lock:
+            self.refresh()
+            return len(self.frames)
+
+    def compress(self, text: str) -> bytes:
+        """Frame for a description, in this store's codec"""
+        data = text.encode('utf-8')
+        if self.codec == ZSTD:
+            return zstandard.ZstdCompressor(level=self.level).compress(data)
+        return zlib.compress(data, self.level)
+
+    def decompress(self, frame: bytes, codec: int) -> Optional[str]:
+        """Description in a frame (None if it can't be read)"""
+        try:
+            if codec == ZSTD:
+                if zstandard is None:
+                    print("Warning: Description was compressed with zstd, but zstandard is not installed")
+                    return None
+                return zstandard.ZstdDecompressor().decompress(frame).decode('utf-8')
+            return zlib.decompress(frame).decode('utf-8')
+        except Exception as e:
+            print(f"Warning: Could not read description from {self.path}: {e}")
+            return None
+
+    def get(self, ref: str) -> Optional[str]:
+        """Full description stored under ref, or None"""
+        with self.lock:
+            self.refresh()
+            frame = self.frames.get(id_digest(ref))
+            if frame is None:
+                return None
+            offset, length, codec = frame
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                data = f.read(length)
+        return self.decompress(data, codec)
+
+    def add(self, descriptions: Dict[str, str]) -> int:
+        """Store descriptions (ref -> text) not stored yet, returning how many were added"""
+        with self.lock:
+            self.refresh()
+            new = {}
+            for ref, text in descriptions.items():
+                digest = id_digest(ref)
+                if text and digest not in self.frames:
+                    new[digest] = text
+            if not new:
+                return 0
+
+            # Frames first, so the index never points past the end of the data file
+            records = []
+            with open(self.path, 'ab') as f:
+                offset = f.tell()
+                for digest, text in new.items():
+                    frame = self.compress(text)
+                    f.write(frame)
+                    records.append(RECORD.pack(digest, offset, len(frame), self.codec))
+                    offset += len(frame)
+            with open(self.index_path, 'ab') as f:
+                if f.tell() != self.offset:
+                    f.truncate(self.offset)
+                f.write(b''.join(records))
+            self.refresh()
+            return len(records)
+
+    def detach(self, jobs: List) -> int:
+        """Move the descriptions of jobs into the store, leaving a description_ref in each job"""
+        descriptions = {}
+        for job in jobs:
+            if job.get('description'):
+                descriptions[job['id']] = job['description']
+                job['description'] = ''
+                job['description_ref'] = job['id']
+        return self.add(descriptions)
+
+    def prune(self, refs: Iterable[str]) -> int:
+        """Drop descriptions not in refs once they outweigh the rest, returning how many were dropped"""
+        with self.lock:
+            self.refresh()
+            live = {id_digest(ref) for ref in refs if ref}
+            dead_bytes = sum(length for digest, (_, length, _) in self.frames.items() if digest not in live)
+            live_bytes = sum(length for digest, (_, length, _) in self.frames.items() if digest in live)
+            if dead_bytes < max(COMPACT_MIN_DEAD, live_bytes):
+                return 0
+
+            # Copy the live frames as they are, in file order, into new files
+            kept = sorted((frame, digest) for digest, frame in self.frames.items() if digest in live)
+            records = []
+            with open(self.path, 'rb') as src, open(self.path + '.tmp', 'wb') as dst:
+                for (offset, length, codec), digest in kept:
+                    src.seek(offset)
+                    records.append(RECORD.pack(digest, dst.tell(), length, codec))
+                    dst.write(src.read(length))
+            with open(self.index_path + '.tmp', 'wb') as f:
+                f.write(b''.join(records))
+            os.replace(self.path + '.tmp', self.path)
+            os.replace(self.index_path + '.tmp', self.index_path)
+
+            dropped = len(self.frames) - len(kept)
+            self.refresh()
+            return dropped
+
+    def close(self):
+        """Nothing to release (files are only open while reading or writing)"""
+
+
+def open_descriptions(settings: Dict, base_dir: str = '.') -> Optional[DescriptionStore]:
+    """Description store configured in settings, or None when full_descriptions is off"""
+    if not settings.get('full_descriptions', False):
+        return None
+    path = os.path.join(base_dir, settings.get('descriptions_file', 'descriptions.bin'))
+    if path not in _description_stores:
+        _description_stores[path] = DescriptionStore(path, settings.get('description_compression', 'zlib'))
+    return _description_stores[path]
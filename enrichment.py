@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Job detail enrichment
+Fetches the detail page of newly found jobs whose listing had no (or a
+truncated) description, and keeps the results in a per-URL cache so detail
+pages are never downloaded twice.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+
+from bs4 import BeautifulSoup
+
+
+# Where the job description lives on common detail pages, most specific first
+DESCRIPTION_SELECTORS = [
+    '#content',                        # Greenhouse (classic boards)
+    '.job__description',               # Greenhouse (new boards)
+    '[data-qa="job-description"]',     # Lever
+    '.posting-page .section-wrapper',  # Lever (older pages)
+    '[class*="descriptionText"]',      # Ashby
+    '[class*="job-description"]',
+    'article',
+    'main',
+]
+
+# Listing descriptions are cut to this many characters by the scrapers
+TRUNCATED_LENGTH = 500
+
+
+class DetailCache:
+    """Thread-safe JSON file of detail-page descriptions, keyed by job URL"""
+
+    def __init__(self, path: str):
+        """Load the cache from path (missing or invalid files start empty)"""
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.entries = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                print(f"Warning: Could not read {path}, starting with an empty detail cache")
+
+    def get(self, url: str) -> Optional[str]:
+        """Cached description for url, if any"""
+        with self.lock:
+            entry = self.entries.get(url)
+        return entry['description'] if entry else None
+
+    def put(self, url: str, description: str):
+        """Cache the description found at url"""
+        with self.lock:
+            self.entries[url] = {'description': description, 'fetched_at': time.time()}
+
+    def save(self, max_age_days: Optional[int] = None):
+        """Write the cache, dropping entries older than max_age_days"""
+        with self.lock:
+            if max_age_days:
+                cutoff = time.time() - max_age_days * 86400
+                self.entries = {url: entry for url, entry in self.entries.items()
+                                if entry['fetched_at'] > cutoff}
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+
+
+class DetailEnricher:
+    """Fills in full descriptions for new jobs from their detail pages"""
+
+    def __init__(self, scraper):
+        """Initialize enricher around a JobScraper (used for config, fetching and state)"""
+        self.scraper = scraper
+        settings = scraper.config.get('settings', {})
+        self.max_workers = max(1, int(settings.get('enrich_workers', 4)))
+        self.max_age_days = settings.get('max_age_days')
+        self.cache = DetailCache(os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            settings.get('detail_cache_file', 'detail_cache.json')
+        ))
+
+    def needs_description(self, job: Dict) -> bool:
+        """Whether a job's description is missing or was truncated"""
+        return bool(job.get('url')) and len(job.get('description', '')) in (0, TRUNCATED_LENGTH)
+
+    def extract_description(self, content: bytes, selector: Optional[str] = None) -> str:
+        """Description text of a job detail page ('' if none was found)"""
+        soup = BeautifulSoup(content, 'lxml')
+        for tag in soup(['script', 'style', 'noscript']):
+            tag.decompose()
+
+        for pattern in ([selector] if selector else []) + DESCRIPTION_SELECTORS:
+            elem = soup.select_one(pattern)
+            if elem:
+                text = elem.get_text('\n', strip=True)
+                if text:
+                    return text
+
+        meta = soup.find('meta', attrs={'name': 'description'})
+        return meta.get('content', '').strip() if meta else ''
+
+    def fetch_description(self, job: Dict, board: Dict) -> Optional[str]:
+        """Description for a job, from the cache or its detail page"""
+        description = self.cache.get(job['url'])
+        if description is not None:
+            return description
+
+        try:
+            response = self.scraper.fetch(board, job['url'])
+            response.raise_for_status()
+            description = self.extract_description(response.content, board.get('detail_selector'))
+        except Exception as e:
+            print(f"Error fetching details for {job['title']} ({job['url']}): {e}")
+            return None
+
+        self.cache.put(job['url'], description)
+        return description
+
+    def enrich(self, jobs: List[Dict]) -> int:
+        """Fill in descriptions of jobs in place, returning how many were updated"""
+        boards = {board.get('name'): board for board in self.scraper.config.get('job_boards', [])}
+        pending = [job for job in jobs if self.needs_description(job) and job.get('source') in boards]
+        if not pending:
+            return 0
+
+        print(f"Fetching details for {len(pending)} new jobs...")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            descriptions = list(executor.map(
+                lambda job: self.fetch_description(job, boards[job['source']]), pending))
+
+        updated = 0
+        for job, description in zip(pending, descriptions):
+            if description and len(description) > len(job.get('description', '')):
+                job['description'] = description
+                updated += 1
+
+        if not self.scraper.replay:
+            self.cache.save(self.max_age_days)
+        print(f"  Added descriptions to {updated} jobs")
+        return updated
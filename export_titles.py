@@ -1,69 +1,39 @@
 #!/usr/bin/env python3
 """
-Export job titles to a simple text file
+Export job titles to a simple text file (and CSV, and optionally JSON)
 """
 
-import json
-from collections import defaultdict
-from datetime import datetime
+import argparse
 
+from exports import CSV_COLUMNS, CsvSink, JsonSink, TitlesSink, export_jobs
+from job_store import configured_store
 
-def main():
-    try:
-        with open('jobs.json', 'r') as f:
-            jobs = json.load(f)
-    except FileNotFoundError:
-        print("No jobs found. Run 'python3 scraper.py' first.")
-        return
-
-    if not jobs:
-        print("No jobs in database.")
-        return
-
-    # Group by company
-    by_company = defaultdict(list)
-    for job in jobs:
-        by_company[job['source']].append(job)
-
-    # Export to text file
-    output_file = 'job_titles.txt'
-    with open(output_file, 'w') as f:
-        f.write("=" * 70 + "\n")
-        f.write(f"JOB TITLES EXPORT - {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
-        f.write("=" * 70 + "\n")
-        f.write(f"Total Jobs: {len(jobs)}\n")
-        f.write("=" * 70 + "\n\n")
-
-        for company in sorted(by_company.keys()):
-            company_jobs = by_company[company]
-            f.write(f"\n{company} ({len(company_jobs)} jobs)\n")
-            f.write("-" * 70 + "\n")
 
-            for i, job in enumerate(company_jobs, 1):
-                location = f" | {job['location']}" if job['location'] else ""
-                f.write(f"{i}. {job['title']}{location}\n")
-
-        f.write("\n" + "=" * 70 + "\n")
-        f.write(f"Total: {len(jobs)} job openings\n")
-        f.write("=" * 70 + "\n")
-
-    print(f"✓ Job titles exported to: {output_file}")
-    print(f"✓ Total jobs exported: {len(jobs)}")
-
-    # Also create CSV format
-    csv_file = 'job_titles.csv'
-    with open(csv_file, 'w') as f:
-        f.write("Company,Title,Location,Department,Type,URL\n")
-        for job in jobs:
-            company = job['source'].replace(',', ' ')
-            title = job['title'].replace(',', ' ')
-            location = job.get('location', '').replace(',', ' ')
-            department = job.get('department', '').replace(',', ' ')
-            emp_type = job.get('employment_type', '').replace(',', ' ')
-            url = job['url']
-            f.write(f"{company},{title},{location},{department},{emp_type},{url}\n")
+def main():
+    parser = argparse.ArgumentParser(description='Export the stored jobs to text, CSV and JSON files')
+    parser.add_argument('--json', action='store_true', help='also write every job to job_titles.json')
+    args = parser.parse_args()
 
-    print(f"✓ CSV format exported to: {csv_file}")
+    store = configured_store()
+    try:
+        if not store.exists():
+            print("No jobs found. Run 'python3 scraper.py' first.")
+            return
+        total = store.count()
+        if not total:
+            print("No jobs in database.")
+            return
+
+        sinks = [TitlesSink('job_titles.txt', heading='JOB TITLES EXPORT', footer=True),
+                 CsvSink('job_titles.csv', CSV_COLUMNS[:6])]
+        if args.json:
+            sinks.append(JsonSink('job_titles.json'))
+        written = export_jobs(sinks, store)
+    finally:
+        store.close()
+
+    if written:
+        print(f"✓ Total jobs exported: {total}")
     print(f"\nYou can open these files in any text editor or spreadsheet app.")
 
 
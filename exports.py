@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Job exports
+Each export format is a sink that is fed the stored jobs one at a time, so
+every format is written in a single pass over the jobs. With a state file,
+the store's version (see job_store) is recorded for each output, and sinks
+whose output was written from the same version are skipped, without
+loading the jobs at all when every output is up to date.
+
+The columnar snapshot (jobs.parquet with pyarrow, else jobs.npz with
+NumPy) holds the jobs as typed columns for analysis: timestamps are real
+timestamps and the repeated strings are dictionary-encoded.
+"""
+
+import csv
+import os
+import re
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+import json_codec
+from id_index import file_stamp
+from job_record import to_dict
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# (header, job key) of the CSV columns written by the scraper
+CSV_COLUMNS = [
+    ('Company', 'source'),
+    ('Title', 'title'),
+    ('Location', 'location'),
+    ('Department', 'department'),
+    ('Type', 'employment_type'),
+    ('URL', 'url'),
+    ('Date Posted', 'date_posted'),
+    ('Scraped At', 'scraped_at'),
+]
+
+# Columns of the columnar snapshot: plain strings, dictionary-encoded strings and timestamps
+SNAPSHOT_STRINGS = ('id', 'title', 'url', 'date_posted', 'native_id')
+SNAPSHOT_CATEGORIES = ('source', 'company', 'location', 'department', 'employment_type')
+SNAPSHOT_TIMESTAMPS = ('scraped_at', 'posted_at')
+
+# Posting dates given as epoch milliseconds (Lever) or seconds
+EPOCH = re.compile(r'^\d{10}(\d{3})?$')
+
+
+class Sink:
+    """One export file, written to a temporary file and moved into place when complete"""
+
+    # Label in messages, and the version of the output format (bump it to rewrite existing files)
+    LABEL = ''
+    FORMAT = 1
+
+    def __init__(self, path: str):
+        """Sink writing to path"""
+        self.path = path
+        self.file = None
+
+    def open(self):
+        """Start writing"""
+        self.file = open(self.path + '.tmp', 'w', newline='', encoding='utf-8')
+
+    def write(self, job):
+        """Add one job"""
+
+    def finish(self):
+        """Write whatever comes after the last job"""
+
+    def close(self):
+        """Finish the file and move it into place"""
+        self.finish()
+        self.file.close()
+        os.replace(self.path + '.tmp', self.path)
+
+    def abort(self):
+        """Drop the partial file, keeping the previous export"""
+        if self.file is not None:
+            self.file.close()
+        try:
+            os.remove(self.path + '.tmp')
+        except FileNotFoundError:
+            pass
+
+
+class JsonSink(Sink):
+    """JSON array of the jobs"""
+
+    LABEL = 'JSON'
+
+    def open(self):
+        """Start the array"""
+        super().open()
+        self.file.write('[')
+        self.count = 0
+
+    def write(self, job):
+        """Add one job to the array"""
+        if self.count:
+            self.file.write(',')
+        self.file.write(json_codec.dumps(job, default=to_dict).decode('utf-8'))
+        self.count += 1
+
+    def finish(self):
+        """End the array"""
+        self.file.write(']\n')
+
+
+class CsvSink(Sink):
+    """CSV with one row per job, quoted by the csv module"""
+
+    LABEL = 'CSV'
+    FORMAT = 2
+
+    def __init__(self, path: str, columns: List[tuple] = CSV_COLUMNS):
+        """Sink writing the (header, job key) columns to path"""
+        super().__init__(path)
+        self.columns = columns
+
+    def open(self):
+        """Start the file with the header row"""
+        super().open()
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([header for header, _ in self.columns])
+
+    def write(self, job):
+        """Add a row for one job"""
+        self.writer.writerow([job.get(key) or '' for _, key in self.columns])
+
+
+class TitlesSink(Sink):
+    """Plain text list of job titles, grouped by board"""
+
+    LABEL = 'TXT'
+
+    def __init__(self, path: str, heading: str = 'JOB TITLES', footer: bool = False):
+        """Sink writing to path under heading, optionally ending with the total"""
+        super().__init__(path)
+        self.heading = heading
+        self.footer = footer
+
+    def open(self):
+        """Start collecting titles"""
+        super().open()
+        self.by_company = defaultdict(list)
+        self.count = 0
+
+    def write(self, job):
+        """Collect one job's title and location (the file needs the totals first)"""
+        self.by_company[job['source']].append((job['title'], job.get('location')))
+        self.count += 1
+
+    def finish(self):
+        """Write the collected titles"""
+        f = self.file
+        f.write("=" * 70 + "\n")
+        f.write(f"{self.heading} - {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+        f.write("=" * 70 + "\n")
+        f.write(f"Total Jobs: {self.count}\n")
+        f.write("=" * 70 + "\n\n")
+
+        for company in sorted(self.by_company.keys()):
+            company_jobs = self.by_company[company]
+            f.write(f"\n{company} ({len(company_jobs)} jobs)\n")
+            f.write("-" * 70 + "\n")
+            for i, (title, location) in enumerate(company_jobs, 1):
+                location = f" | {location}" if location else ""
+                f.write(f"{i}. {title}{location}\n")
+
+        f.write("\n" + "=" * 70 + "\n")
+        if self.footer:
+            f.write(f"Total: {self.count} job openings\n")
+            f.write("=" * 70 + "\n")
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """Naive datetime for an ISO date/time (aware ones in UTC) or epoch (milli)seconds in UTC, or None"""
+    if value is None or value == '':
+        return None
+    text = str(value).strip()
+    try:
+        if EPOCH.match(text):
+            seconds = int(text) / (1000 if len(text) == 13 else 1)
+            return datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None)
+        parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except (ValueError, OverflowError, OSError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class ColumnarSink(Sink):
+    """Columnar snapshot of the jobs, built from per-column lists once every job is in"""
+
+    LABEL = 'snapshot'
+
+    def open(self):
+        """Start collecting columns"""
+        self.file = open(self.path + '.tmp', 'wb')
+        self.columns = {name: [] for name in SNAPSHOT_STRINGS + SNAPSHOT_CATEGORIES + SNAPSHOT_TIMESTAMPS}
+
+    def write(self, job):
+        """Add one job's values to the columns"""
+        for name in SNAPSHOT_STRINGS + SNAPSHOT_CATEGORIES:
+            value = job.get(name)
+            self.columns[name].append(None if value is None else str(value))
+        self.columns['scraped_at'].append(parse_timestamp(job.get('scraped_at')))
+        self.columns['posted_at'].append(parse_timestamp(job.get('date_posted')))
+
+
+class ParquetSink(ColumnarSink):
+    """jobs.parquet: string columns, dictionary-encoded categories and timestamp[us] columns"""
+
+    LABEL = 'Parquet'
+
+    def finish(self):
+        """Build the Arrow table and write it as Parquet"""
+        arrays = {}
+        for name in SNAPSHOT_STRINGS:
+            arrays[name] = pyarrow.array(self.columns[name], pyarrow.string())
+        for name in SNAPSHOT_CATEGORIES:
+            arrays[name] = pyarrow.array(self.columns[name], pyarrow.string()).dictionary_encode()
+        for name in SNAPSHOT_TIMESTAMPS:
+            arrays[name] = pyarrow.array(self.columns[name], pyarrow.timestamp('us'))
+        pyarrow.parquet.write_table(pyarrow.table(arrays), self.file, compression='zstd')
+
+
+class NpzSink(ColumnarSink):
+    """jobs.npz: NumPy arrays, with <name>_codes/<name>_values for categories and datetime64[us] timestamps
+
+    Each plain string column is <name>_data, the UTF-8 values one after
+    another, and <name>_offsets, where job i's value is
+    data[offsets[i]:offsets[i + 1]] ('' when it has none; see
+    unpack_strings), so one long title or URL doesn't widen the whole
+    column. Codes are int32 indexes into the sorted values, -1 where a job
+    has no value; missing timestamps are NaT. Loads without pickle.
+    """
+
+    LABEL = 'NumPy'
+    FORMAT = 2
+
+    def finish(self):
+        """Build the arrays and write them, compressed"""
+        arrays = {}
+        for name in SNAPSHOT_STRINGS:
+            encoded = [(value or '').encode('utf-8') for value in self.columns[name]]
+            offsets = numpy.zeros(len(encoded) + 1, dtype=numpy.int64)
+            numpy.cumsum([len(value) for value in encoded], out=offsets[1:])
+            arrays[name + '_offsets'] = offsets
+            arrays[name + '_data'] = numpy.frombuffer(b''.join(encoded), dtype=numpy.uint8)
+        for name in SNAPSHOT_CATEGORIES:
+            values = sorted({value for value in self.columns[name] if value is not None})
+            codes = {value: i for i, value in enumerate(values)}
+            arrays[name + '_values'] = numpy.array(values, dtype=str)
+            arrays[name + '_codes'] = numpy.array(
+                [codes.get(value, -1) for value in self.columns[name]], dtype=numpy.int32)
+        for name in SNAPSHOT_TIMESTAMPS:
+            arrays[name] = numpy.array(
+                [value if value is not None else 'NaT' for value in self.columns[name]], dtype='datetime64[us]')
+        numpy.savez_compressed(self.file, **arrays)
+
+
+def unpack_strings(offsets, data) -> List[str]:
+    """Values of a string column of jobs.npz, from its <name>_offsets and <name>_data arrays"""
+    buffer = data.tobytes()
+    bounds = offsets.tolist()
+    return [buffer[start:end].decode('utf-8') for start, end in zip(bounds, bounds[1:])]
+
+
+def columnar_sink(base_path: str) -> Optional[ColumnarSink]:
+    """Snapshot sink writing base_path + '.parquet' (pyarrow) or '.npz' (NumPy), or None without either"""
+    if pyarrow is not None:
+        return ParquetSink(base_path + '.parquet')
+    if numpy is not None:
+        return NpzSink(base_path + '.npz')
+    print("Warning: Columnar snapshot needs pyarrow or numpy (pip3 install pyarrow), skipping it")
+    return None
+
+
+def load_state(state_path: Optional[str]) -> Dict:
+    """Recorded exports (output path -> version, format and file stamp)"""
+    if not state_path:
+        return {}
+    try:
+        return json_codec.load(state_path)
+    except (FileNotFoundError, json_codec.JSONDecodeError):
+        return {}
+
+
+def is_up_to_date(sink: Sink, state: Dict, version: Optional[str]) -> bool:
+    """Whether sink's file was written from this version of the jobs, and not touched since"""
+    entry = state.get(os.path.abspath(sink.path))
+    stamp = file_stamp(sink.path)
+    return (version is not None and entry is not None and stamp is not None
+            and entry['version'] == version and entry['format'] == [type(sink).__name__, sink.FORMAT]
+            and tuple(entry['stamp']) == stamp)
+
+
+def export_jobs(sinks: List[Sink], store, state_path: Optional[str] = None,
+                jobs: Optional[Iterable] = None) -> List[Sink]:
+    """Write every sink that is out of date in one pass over the jobs, returning those written
+
+    The jobs are read from store unless they are given (e.g. already
+    loaded). Without state_path every sink is written.
+    """
+    state = load_state(state_path)
+    version = store.version()
+    stale = [sink for sink in sinks if not is_up_to_date(sink, state, version)]
+    for sink in sinks:
+        if sink not in stale:
+            print(f"{sink.LABEL} export is up to date: {sink.path}")
+    if not stale:
+        return []
+
+    open_sinks = []
+    for sink in stale:
+        try:
+            sink.open()
+            open_sinks.append(sink)
+        except Exception as e:
+            print(f"Warning: Could not export {sink.LABEL}: {e}")
+            sink.abort()
+
+    for job in (store.all_jobs() if jobs is None else jobs):
+        for sink in list(open_sinks):
+            try:
+                sink.write(job)
+            except Exception as e:
+                print(f"Warning: Could not export {sink.LABEL}: {e}")
+                sink.abort()
+                open_sinks.remove(sink)
+
+    written = []
+    for sink in open_sinks:
+        try:
+            sink.close()
+        except Exception as e:
+            print(f"Warning: Could not export {sink.LABEL}: {e}")
+            sink.abort()
+            continue
+        written.append(sink)
+        print(f"Exported to {sink.LABEL}: {sink.path}")
+        state[os.path.abspath(sink.path)] = {
+            'version': version,
+            'format': [type(sink).__name__, sink.FORMAT],
+            'stamp': list(file_stamp(sink.path)),
+        }
+
+    if state_path and written:
+        json_codec.dump(state, state_path)
+    return written
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+HTML parser backends
+BeautifulSoup with html.parser or lxml, or selectolax (a C CSS selector
+engine) when it is installed. All backends return objects with the same
+small subset of the BeautifulSoup Tag API: .name, .text, .get(), .select()
+and .select_one().
+"""
+
+import json
+import re
+from typing import Dict, List, Optional, Union
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+
+BACKENDS = ('html.parser', 'lxml', 'selectolax')
+
+_warned = set()
+
+# Compiled selector sets, keyed by the JSON of the selector config
+_compiled_selectors = {}
+
+# Leading compound of a selector made only of parts a SoupStrainer can check:
+# a tag name, #id, .class, [attr] and [attr=value]
+LEADING_COMPOUND = re.compile(r"""
+    \s*(?P<tag>[a-zA-Z][\w-]*)?
+    (?P<filters>(?:[.\#][\w-]+|\[\s*[\w-]+\s*(?:=\s*(?:"[^"]*"|'[^']*'|[\w-]+)\s*)?\])*)
+""", re.VERBOSE)
+FILTER = re.compile(r"""([.\#])([\w-]+)|\[\s*([\w-]+)\s*(?:=\s*(?:"([^"]*)"|'([^']*)'|([\w-]+))\s*)?\]""")
+
+
+def available_backends() -> List[str]:
+    """Backends that can be used in this environment"""
+    return [backend for backend in BACKENDS if backend != 'selectolax' or SelectolaxParser is not None]
+
+
+def soup_backend(backend: str) -> str:
+    """BeautifulSoup parser to use for a backend (selectolax maps to lxml)"""
+    if backend not in BACKENDS:
+        if backend not in _warned:
+            _warned.add(backend)
+            print(f"Warning: Unknown parser '{backend}', using html.parser")
+        return 'html.parser'
+    return 'lxml' if backend == 'selectolax' else backend
+
+
+class SelectolaxNode:
+    """selectolax node exposing the BeautifulSoup Tag methods the scrapers use"""
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        """Wrap a selectolax node"""
+        self.node = node
+
+    @property
+    def name(self) -> str:
+        """Tag name"""
+        return self.node.tag
+
+    @property
+    def text(self) -> str:
+        """All text inside the node"""
+        return self.node.text(deep=True)
+
+    def get(self, attr: str, default=None):
+        """Attribute value, or default if the attribute is missing"""
+        value = self.node.attributes.get(attr)
+        return default if value is None else value
+
+    def select(self, selector: str) -> List['SelectolaxNode']:
+        """All descendants matching a CSS selector"""
+        return [SelectolaxNode(node) for node in self.node.css(selector)]
+
+    def select_one(self, selector: str) -> Optional['SelectolaxNode']:
+        """First descendant matching a CSS selector, or None"""
+        node = self.node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+
+def parse_html(content: Union[bytes, str], backend: str = 'html.parser',
+               parse_only: Optional[SoupStrainer] = None):
+    """Parse a page with the given backend
+
+    Falls back to lxml (with a warning) when selectolax is asked for but
+    not installed. parse_only restricts BeautifulSoup backends to the
+    matching subtrees; selectolax always parses the whole page.
+    """
+    if backend == 'selectolax':
+        if SelectolaxParser is not None:
+            root = SelectolaxParser(content).root
+            if root is not None:
+                return SelectolaxNode(root)
+        elif backend not in _warned:
+            _warned.add(backend)
+            print("Warning: selectolax is not installed (pip3 install selectolax), using lxml")
+
+    return BeautifulSoup(content, soup_backend(backend), parse_only=parse_only)
+
+
+def leading_compound(selector: str) -> Optional[Dict]:
+    """Tag/id/class/attribute tests of a selector's first compound, if a strainer can scope it
+
+    None when that compound uses anything else (pseudo-classes, namespaces,
+    attribute operators) or is followed by a sibling combinator, since the
+    elements it matches would then not contain every match of the selector.
+    """
+    match = LEADING_COMPOUND.match(selector)
+    rest = selector[match.end():]
+    if not (match.group('tag') or match.group('filters')):
+        return None
+    if rest and not (rest[0].isspace() or rest[0] == '>'):
+        return None
+    if rest.strip()[:1] in ('+', '~'):
+        return None
+
+    compound = {'tag': (match.group('tag') or '').lower(), 'classes': [], 'attrs': []}
+    for symbol, name, attr, *values in FILTER.findall(match.group('filters')):
+        if symbol == '.':
+            compound['classes'].append(name)
+        elif symbol == '#':
+            compound['attrs'].append(('id', name))
+        else:
+            value = next((v for v in values if v), None)
+            compound['attrs'].append((attr.lower(), value))
+    return compound
+
+
+def compound_matches(compound: Dict, name: str, attrs) -> bool:
+    """Whether a start tag matches a compound from leading_compound()"""
+    if compound['tag'] and name != compound['tag']:
+        return False
+    attrs = attrs or {}
+    if compound['classes']:
+        classes = attrs.get('class') or ''
+        classes = classes.split() if isinstance(classes, str) else classes
+        if not all(cls in classes for cls in compound['classes']):
+            return False
+    for attr, value in compound['attrs']:
+        if attr not in attrs or (value is not None and attrs[attr] != value):
+            return False
+    return True
+
+
+def container_strainer(selector: str) -> Optional[SoupStrainer]:
+    """SoupStrainer keeping only subtrees that can contain matches of selector
+
+    The strainer keeps every element matching the first compound of the
+    selector (or of each selector in a list) along with its whole subtree,
+    which is where all matches of the full selector are. None when the
+    selector can't be scoped that way and the page must be parsed in full.
+    """
+    parts = selector.split(',') if '(' not in selector and '[' not in selector else [selector]
+    compounds = [leading_compound(part) for part in parts]
+    if not compounds or None in compounds:
+        return None
+    return SoupStrainer(lambda name, attrs: any(compound_matches(compound, name, attrs)
+                                                for compound in compounds))
+
+
+class CompiledSelector:
+    """CSS selector compiled once, applicable to nodes from any backend"""
+
+    __slots__ = ('selector', 'pattern', '_strainer')
+
+    def __init__(self, selector: str):
+        """Compile selector (raises soupsieve.SelectorSyntaxError if invalid)"""
+        self.selector = selector
+        self.pattern = soupsieve.compile(selector)
+        self._strainer = False
+
+    @property
+    def strainer(self) -> Optional[SoupStrainer]:
+        """SoupStrainer limiting a parse to subtrees that can match (None if not scopable)"""
+        if self._strainer is False:
+            self._strainer = container_strainer(self.selector)
+        return self._strainer
+
+    def select(self, node) -> List:
+        """All descendants of node matching the selector"""
+        if isinstance(node, SelectolaxNode):
+            # selectolax takes selector strings; there is no compiled form to reuse
+            return node.select(self.selector)
+        return self.pattern.select(node)
+
+    def select_one(self, node):
+        """First descendant of node matching the selector, or None"""
+        if isinstance(node, SelectolaxNode):
+            return node.select_one(self.selector)
+        return self.pattern.select_one(node)
+
+
+def compile_selectors(selectors: Dict[str, str]) -> Dict[str, Optional[CompiledSelector]]:
+    """Compile a set of named selectors, with None for empty ones
+
+    The result is cached for the life of the process, so boards sharing a
+    selector config (or scraped again) never compile a selector twice.
+    """
+    key = json.dumps(selectors, sort_keys=True)
+    compiled = _compiled_selectors.get(key)
+    if compiled is None:
+        compiled = {name: CompiledSelector(selector.strip()) if selector and selector.strip() else None
+                    for name, selector in selectors.items()}
+        _compiled_selectors[key] = compiled
+    return compiled
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP session shared by the scraper and the web interface
+Keeps connections alive between requests to the same host and counts how
+often a connection was reused.
+"""
+
+import threading
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# gzip/deflate always, plus br/zstd when urllib3 has a decoder installed for them
+ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
+
+
+class CountingAdapter(HTTPAdapter):
+    """HTTPAdapter that counts the requests its pools send and the TCP connects they make"""
+
+    def __init__(self, *args, **kwargs):
+        self._lock = threading.Lock()
+        self._retired = {'requests': 0}
+        self._connects = 0
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pools.dispose_func = self._retire_pool
+        # Pools whose connections count every connect, including reconnects after the
+        # server closed a kept-alive connection (which reuse the connection object)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: type(pool_cls.__name__, (pool_cls,),
+                         {'ConnectionCls': self._counting_connection(pool_cls.ConnectionCls)})
+            for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    def _counting_connection(self, connection_cls):
+        """Subclass of connection_cls that counts its connects in this adapter"""
+        adapter = self
+
+        class CountingConnection(connection_cls):
+            def connect(self):
+                """Open the TCP connection, counting it"""
+                with adapter._lock:
+                    adapter._connects += 1
+                return super().connect()
+
+        return CountingConnection
+
+    def _retire_pool(self, pool):
+        """Record a pool's request count before it is closed"""
+        with self._lock:
+            self._retired['requests'] += pool.num_requests
+        pool.close()
+
+    def connection_stats(self) -> Dict:
+        """Requests sent and connections opened by this adapter"""
+        with self._lock:
+            stats = dict(self._retired, new_connections=self._connects)
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                stats['requests'] += pool.num_requests
+        return stats
+
+
+class PooledSession(requests.Session):
+    """requests.Session with keep-alive pools sized per host"""
+
+    def __init__(self, pool_size: int = 4, max_hosts: int = 100, headers: Dict = None):
+        super().__init__()
+        self.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept-Encoding': ACCEPT_ENCODING,
+        })
+        if headers:
+            self.headers.update(headers)
+
+        self.counting_adapters = []
+        for prefix in ('https://', 'http://'):
+            adapter = CountingAdapter(pool_connections=max_hosts, pool_maxsize=pool_size)
+            self.mount(prefix, adapter)
+            self.counting_adapters.append(adapter)
+
+    def connection_stats(self) -> Dict:
+        """Requests sent, connections opened and connections reused"""
+        stats = {'requests': 0, 'new_connections': 0}
+        for adapter in self.counting_adapters:
+            for key, value in adapter.connection_stats().items():
+                stats[key] += value
+        stats['reused_connections'] = max(0, stats['requests'] - stats['new_connections'])
+        return stats
+
+
+def create_session(settings: Dict = None) -> PooledSession:
+    """Create a pooled session from the scraper settings"""
+    settings = settings or {}
+    return PooledSession(
+        pool_size=max(1, int(settings.get('pool_size', 4))),
+        max_hosts=max(1, int(settings.get('pool_hosts', 100))),
+    )
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Persistent job ID index
+A sorted array of 16-byte digests of the stored job IDs, kept next to the
+jobs file (jobs.json.ids) and memory-mapped, so checking which of a run's
+jobs are already stored is a binary search per job instead of loading
+every stored job. The header records the size, mtime and inode of the jobs
+file the index was written for; an index that doesn't match is ignored and
+rebuilt on the next save.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from typing import Dict, Iterable, Optional, Set
+
+MAGIC = b'JOBIDS1\n'
+# magic, then the jobs file's size, mtime (ns) and inode
+HEADER = struct.Struct('<8sQQQ')
+DIGEST_SIZE = 16
+
+
+def id_digest(job_id: str) -> bytes:
+    """16-byte digest of a job ID (the ID itself for the usual 32 hex digit IDs)"""
+    job_id = str(job_id)
+    if len(job_id) == 32:
+        try:
+            return bytes.fromhex(job_id)
+        except ValueError:
+            pass
+    return hashlib.md5(job_id.encode('utf-8')).digest()
+
+
+def sorted_digests(ids: Iterable[str]) -> bytes:
+    """Index data for ids: their digests, sorted and without duplicates"""
+    return b''.join(sorted({id_digest(job_id) for job_id in ids}))
+
+
+def file_stamp(path: str) -> Optional[tuple]:
+    """(size, mtime_ns, inode) of a file, or None if it doesn't exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+class Digests:
+    """Sequence view of the digests in a mapped index, for bisect"""
+
+    def __init__(self, buffer, count: int):
+        """View count digests following the header in buffer"""
+        self.buffer = buffer
+        self.count = count
+
+    def __len__(self) -> int:
+        """Number of digests"""
+        return self.count
+
+    def __getitem__(self, i: int) -> bytes:
+        """The i-th smallest digest"""
+        start = HEADER.size + i * DIGEST_SIZE
+        return self.buffer[start:start + DIGEST_SIZE]
+
+
+class IdIndex:
+    """Sorted digest file for the IDs in one jobs file"""
+
+    def __init__(self, path: str, source_path: str):
+        """Index at path for the jobs file at source_path"""
+        self.path = path
+        self.source_path = source_path
+        self.map = None
+        self.digests = None
+        self.stamp = None
+
+    def open(self) -> bool:
+        """Map the index, returning whether it matches the jobs file as it is now"""
+        stamp = file_stamp(self.source_path)
+        if self.map is not None and stamp == self.stamp:
+            return True
+        self.close()
+        if stamp is None:
+            return False
+
+        try:
+            with open(self.path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return False
+        if len(mapped) < HEADER.size or (len(mapped) - HEADER.size) % DIGEST_SIZE:
+            mapped.close()
+            return False
+        magic, *header_stamp = HEADER.unpack_from(mapped)
+        if magic != MAGIC or tuple(header_stamp) != stamp:
+            mapped.close()
+            return False
+
+        self.map, self.stamp = mapped, stamp
+        self.digests = Digests(mapped, (len(mapped) - HEADER.size) // DIGEST_SIZE)
+        return True
+
+    def __len__(self) -> int:
+        """Number of IDs in the (open) index"""
+        return len(self.digests)
+
+    def position(self, digest: bytes) -> tuple:
+        """Where digest is or would go in the (open) index, and whether it is there"""
+        i = bisect_left(self.digests, digest)
+        return i, i < len(self.digests) and self.digests[i] == digest
+
+    def known_ids(self, ids: Iterable[str]) -> Set[str]:
+        """Which of ids are in the (open) index"""
+        return {job_id for job_id in ids if self.position(id_digest(job_id))[1]}
+
+    def updated(self, changes: Dict[str, bool]) -> bytes:
+        """Index data with the IDs mapped to True added and those mapped to False removed"""
+        edits = []
+        for job_id, present in changes.items():
+            digest = id_digest(job_id)
+            i, found = self.position(digest)
+            if present and not found:
+                edits.append((i, 0, digest))
+            elif found and not present:
+                edits.append((i, 1, digest))
+
+        # Copy the unchanged runs between edits straight from the mapped file
+        parts, copied = [], 0
+        for i, removal, digest in sorted(edits):
+            parts.append(self.map[HEADER.size + copied * DIGEST_SIZE:HEADER.size + i * DIGEST_SIZE])
+            if removal:
+                copied = i + 1
+            else:
+                copied = i
+                parts.append(digest)
+        parts.append(self.map[HEADER.size + copied * DIGEST_SIZE:])
+        return b''.join(parts)
+
+    def write(self, data: bytes):
+        """Replace the index with data, stamped with the jobs file as it is now"""
+        self.close()
+        stamp = file_stamp(self.source_path)
+        if stamp is None:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, *stamp))
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+    def close(self):
+        """Unmap the index"""
+        if self.map is not None:
+            self.map.close()
+        self.map = self.digests = self.stamp = None
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Job identity
+A job's ID is a 128-bit BLAKE2b digest written as 32 hex digits. Jobs from
+platforms that number their postings (Greenhouse, Lever, Ashby, Next.js
+boards, and API boards that map a native_id field) carry that number as
+native_id, e.g. "greenhouse:4012345", and are identified by it and their
+board, so editing a title doesn't make a job look new. Other jobs are
+identified by title, company and URL.
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, Iterable
+
+UUID = r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
+
+# Native IDs in posting URLs, per board type (the payload IDs appear in the URLs too)
+NATIVE_ID_PATTERNS = {
+    'greenhouse': re.compile(r'(?:[?&]gh_jid=|/jobs/)(\d+)'),
+    # Lever and Ashby posting URLs hold the posting's UUID, possibly followed by /apply or /application
+    'lever': re.compile(r'/(' + UUID + r')(?:[/?#]|$)'),
+    'ashby': re.compile(r'/(' + UUID + r')(?:[/?#]|$)'),
+    'nextjs': re.compile(r'/positions/([^/?#]+)'),
+}
+
+# Between the fields of an ID key, so neighbouring fields can't run together
+SEPARATOR = '\x1f'
+
+
+def native_id(board_type: str, value: Any = None, url: str = '') -> str:
+    """A job's "<board type>:<platform ID>", from the payload value or else the URL ('' if neither has one)"""
+    if value is None or value == '':
+        pattern = NATIVE_ID_PATTERNS.get(board_type)
+        match = pattern.search(url) if pattern and url else None
+        if not match:
+            return ''
+        value = match.group(1)
+    return f"{board_type}:{value}"
+
+
+def job_id(job: Dict) -> str:
+    """The ID of a job: from its board and native_id if it has one, else its title, company and URL"""
+    if job.get('native_id'):
+        key = ('native', job.get('source', ''), job['native_id'])
+    else:
+        key = (job.get('title', ''), job.get('company', ''), job.get('url', ''))
+    return hashlib.blake2b(SEPARATOR.join(map(str, key)).encode(), digest_size=16).hexdigest()
+
+
+def job_set_fingerprint(jobs: Iterable[Dict]) -> str:
+    """Hash of the set of IDs of jobs (whether a board's jobs changed between runs)"""
+    return hashlib.md5('\n'.join(sorted(job['id'] for job in jobs)).encode()).hexdigest()
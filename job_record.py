@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Compact job records
+A Job keeps the standard job fields in slots rather than a per-job dict,
+and interns the strings repeated across jobs (company, source, location,
+date posted), so large job sets take a fraction of the memory of dicts.
+Jobs read like the dicts they replace (job['title'], job.get('department'),
+job['is_new'] = True, job.title in templates) and to_dict() gives back the
+same dict, with its keys in the same order.
+"""
+
+import sys
+from typing import Any, Dict, Iterator, List, Mapping
+
+# Fields every job has, in the order the scrapers create them
+JOB_FIELDS = ('title', 'company', 'location', 'description', 'url', 'date_posted',
+              'source', 'scraped_at', 'id')
+
+# Optional fields most jobs have, also kept in slots
+SLOTTED_FIELDS = JOB_FIELDS + ('native_id', 'description_ref')
+
+# Fields shared by many jobs (scraped_at and the rest are unique per job)
+INTERNED_FIELDS = frozenset(('company', 'location', 'date_posted', 'source'))
+
+_SLOTTED = frozenset(SLOTTED_FIELDS)
+
+# One tuple per key order seen, shared by every job with that order
+_key_orders = {}
+
+
+def key_order(keys: tuple) -> tuple:
+    """The shared tuple for a key order"""
+    return _key_orders.setdefault(keys, keys)
+
+
+class Job:
+    """One job, stored in slots with its other keys in a small dict"""
+
+    __slots__ = SLOTTED_FIELDS + ('_keys', '_extra')
+
+    def __init__(self, data: Mapping):
+        """Record for a job dict (or another Job)"""
+        extra = None
+        for key, value in data.items():
+            if key in _SLOTTED:
+                if key in INTERNED_FIELDS and type(value) is str:
+                    value = sys.intern(value)
+                setattr(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self._keys = key_order(tuple(data.keys()))
+        self._extra = extra
+
+    def __getitem__(self, key: str) -> Any:
+        """Value of a key, like dict[key]"""
+        if key in _SLOTTED:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any):
+        """Set a key, like dict[key] = value"""
+        if key not in self:
+            self._keys = key_order(self._keys + (key,))
+        if key in _SLOTTED:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        """Whether the job has a key"""
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        """The job's keys, in order"""
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        """Number of keys"""
+        return len(self._keys)
+
+    def __eq__(self, other) -> bool:
+        """Equal to a Job or dict with the same keys and values"""
+        if isinstance(other, Job):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        """Job({...})"""
+        return f"Job({self.to_dict()!r})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Value of a key, or default if the job doesn't have it"""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> tuple:
+        """The job's keys, in order"""
+        return self._keys
+
+    def items(self) -> List[tuple]:
+        """(key, value) pairs, in order"""
+        return [(key, self[key]) for key in self._keys]
+
+    def copy(self) -> 'Job':
+        """A separate record with the same keys and values"""
+        return Job(self)
+
+    def to_dict(self) -> Dict:
+        """The job as a dict, with its keys in the original order"""
+        return {key: self[key] for key in self._keys}
+
+
+def to_dict(job: Any) -> Dict:
+    """JSON encoder hook for Jobs (json_codec.dumps(..., default=to_dict))"""
+    if isinstance(job, Job):
+        return job.to_dict()
+    raise TypeError(f"Object of type {type(job).__name__} is not JSON serializable")
@@ -0,0 +1,715 @@
+#!/usr/bin/env python3
+"""
+Job storage backends
+jobs.json (the default), an append-only jobs.jsonl log, one JSON file per
+scrape day or a SQLite database, selected with settings.storage. Every
+backend has the same methods, so the scraper, the web UI and the
+command-line viewers don't need to know which one is used. Stored jobs
+are handed out as compact job_record.Job records, which read like dicts.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+import json_codec
+from id_index import IdIndex, file_stamp, sorted_digests
+from job_record import JOB_FIELDS, Job, to_dict
+
+
+STORAGE_BACKENDS = ('json', 'jsonl', 'daily', 'sqlite')
+
+# Day file of jobs whose scraped_at isn't a plain ISO date, and the names of day files
+UNDATED = 'undated'
+DAY_FILE = re.compile(r'^(\d{4}-\d{2}-\d{2}|undated)\.json$')
+
+# Open JSON Lines stores, keyed by path
+_jsonl_stores = {}
+
+# SQL condition for rows whose scraped_at is an ISO date, which compare correctly as strings
+ISO_SCRAPED_AT = "scraped_at GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*'"
+
+
+def is_expired(job: Dict, cutoff: datetime) -> bool:
+    """Whether a job was scraped before cutoff (jobs with unreadable dates are kept)"""
+    try:
+        return datetime.fromisoformat(job.get('scraped_at', '')) <= cutoff
+    except (ValueError, TypeError):
+        return False
+
+
+def iso_scraped_at(job: Dict) -> str:
+    """A job's scraped_at if it is an ISO date, else '' (for ordering by string)"""
+    scraped_at = job.get('scraped_at')
+    if isinstance(scraped_at, str) and len(scraped_at) >= 10 and scraped_at[:4].isdigit() and scraped_at[4] == '-':
+        return scraped_at
+    return ''
+
+
+def scrape_day(job: Dict) -> str:
+    """The day (YYYY-MM-DD) a job was scraped, or UNDATED if its scraped_at can't be compared"""
+    try:
+        scraped_at = datetime.fromisoformat(job.get('scraped_at', ''))
+    except (ValueError, TypeError):
+        return UNDATED
+    # Aware times can't be compared with the naive cutoffs, so they are never expired
+    return UNDATED if scraped_at.tzinfo else scraped_at.date().isoformat()
+
+
+def jobs_by_day(jobs: List[Dict]) -> Dict[str, List[Dict]]:
+    """Jobs grouped by scrape_day"""
+    by_day = {}
+    for job in jobs:
+        by_day.setdefault(scrape_day(job), []).append(job)
+    return by_day
+
+
+def scraped_since(job: Dict, since: datetime) -> bool:
+    """Whether a job was scraped after since"""
+    try:
+        return datetime.fromisoformat(job.get('scraped_at', '')) > since
+    except (ValueError, TypeError):
+        return False
+
+
+def files_version(paths: Iterable[str]) -> Optional[str]:
+    """Version of the saved jobs, from the size, mtime and inode of their files (None if there are none)"""
+    stamps = sorted((os.path.basename(path), stamp) for path in paths
+                    for stamp in [file_stamp(path)] if stamp is not None)
+    if not stamps:
+        return None
+    return hashlib.md5(repr(stamps).encode()).hexdigest()
+
+
+class JsonJobStore:
+    """All jobs in one JSON array, loaded on first use and rewritten on save"""
+
+    def __init__(self, path: str, pretty: bool = False):
+        """Store backed by the JSON file at path"""
+        self.path = path
+        self.pretty = pretty
+        self.jobs = None
+        self.dirty = False
+        self.ids = IdIndex(path + '.ids', path)
+        # Job ID -> stored (True) or removed (False) since the file was loaded
+        self.id_changes = {}
+
+    @property
+    def location(self) -> str:
+        """Where the jobs are kept"""
+        return self.path
+
+    def exists(self) -> bool:
+        """Whether any jobs have been stored yet"""
+        return os.path.exists(self.path)
+
+    def all_jobs(self) -> List[Job]:
+        """Every stored job, oldest first"""
+        if self.jobs is None:
+            try:
+                jobs = json_codec.load(self.path)
+            except (FileNotFoundError, json_codec.JSONDecodeError):
+                jobs = []
+            # Replaced one at a time, so the dicts are freed as the records are made
+            for i, job in enumerate(jobs):
+                jobs[i] = Job(job)
+            self.jobs = jobs
+        return self.jobs
+
+    def count(self) -> int:
+        """Number of stored jobs"""
+        if self.jobs is None and self.ids.open():
+            return len(self.ids)
+        return len(self.all_jobs())
+
+    def known_ids(self, ids: Iterable[str]) -> Set[str]:
+        """Which of ids are already stored (from the ID index while the jobs aren't loaded)"""
+        if self.jobs is None and self.ids.open():
+            return self.ids.known_ids(ids)
+        stored = {job['id'] for job in self.all_jobs()}
+        return {job_id for job_id in ids if job_id in stored}
+
+    def add(self, jobs: List[Dict]):
+        """Store new jobs"""
+        if jobs:
+            self.all_jobs().extend(Job(job) for job in jobs)
+            self.id_changes.update((job['id'], True) for job in jobs)
+            self.dirty = True
+
+    def replace_all(self, jobs: List[Dict]):
+        """Replace every stored job with jobs"""
+        self.id_changes.update((job['id'], False) for job in self.all_jobs())
+        self.jobs = []
+        self.add(jobs)
+        self.dirty = True
+
+    def expire(self, max_age_days: int) -> int:
+        """Delete jobs older than max_age_days, returning how many were deleted"""
+        cutoff = datetime.now() - timedelta(days=max_age_days)
+        jobs = self.all_jobs()
+        self.jobs = [job for job in jobs if not is_expired(job, cutoff)]
+        removed = len(jobs) - len(self.jobs)
+        if removed:
+            self.id_changes.update((job['id'], False) for job in jobs if is_expired(job, cutoff))
+            self.dirty = True
+        return removed
+
+    def jobs_since(self, since: datetime) -> List[Job]:
+        """Jobs scraped after since"""
+        return [job for job in self.all_jobs() if scraped_since(job, since)]
+
+    def count_since(self, since: datetime) -> int:
+        """Number of jobs scraped after since"""
+        return len(self.jobs_since(since))
+
+    def version(self) -> Optional[str]:
+        """Changes whenever the jobs file is saved (None before the first save)"""
+        return files_version([self.path])
+
+    def by_source(self, source: str) -> List[Job]:
+        """Jobs from one board"""
+        return [job for job in self.all_jobs() if job.get('source') == source]
+
+    def save(self):
+        """Write the jobs file if anything changed (or it doesn't exist yet), and its ID index"""
+        if self.dirty or not self.exists():
+            if self.ids.open():
+                ids = self.ids.updated(self.id_changes)
+            else:
+                ids = sorted_digests(job['id'] for job in self.all_jobs())
+            json_codec.dump(self.all_jobs(), self.path, pretty=self.pretty, default=to_dict)
+            self.ids.write(ids)
+            self.dirty = False
+        elif not self.ids.open():
+            self.ids.write(sorted_digests(job['id'] for job in self.all_jobs()))
+        self.id_changes = {}
+
+    def close(self):
+        """Release the store (unmaps the ID index)"""
+        self.ids.close()
+
+
+class JsonlJobStore:
+    """Append-only JSON Lines job log
+
+    Each line is a job, or a tombstone ({"_deleted": id}) written when
+    expiry removes one. save() only appends the lines for what changed in
+    the run; the file is rewritten (compacted) once dead lines outnumber
+    compact_ratio times the live jobs.
+
+    A store that stays open (the web UI keeps one per file) picks up only
+    the lines appended since it last read, and starts over when the file
+    was compacted. A side file (<path>.index) records, for offsets in the
+    log, the newest scrape time before that offset, so jobs_since() can
+    read just the tail of the log.
+    """
+
+    TOMBSTONE = '_deleted'
+    # Minimum number of dead lines before compacting, and index spacing in a compacted log
+    COMPACT_MIN_DEAD = 1000
+    INDEX_EVERY = 1000
+
+    def __init__(self, path: str, compact_ratio: float = 1.0):
+        """Store backed by the JSON Lines file at path"""
+        self.path = path
+        self.index_path = path + '.index'
+        self.compact_ratio = compact_ratio
+        self.ids = IdIndex(path + '.ids', path)
+        self.lock = threading.RLock()
+        self.reset(None)
+        self.pending = []
+
+    @property
+    def location(self) -> str:
+        """Where the jobs are kept"""
+        return self.path
+
+    def reset(self, inode: Optional[int]):
+        """Forget what was read, to read the file (with the given inode) from the start"""
+        self.inode = inode
+        self.offset = 0
+        self.lines = 0
+        self.jobs = {}
+        self.newest = ''
+
+    def apply(self, record: Dict):
+        """Apply one log record to the in-memory jobs"""
+        self.lines += 1
+        if self.TOMBSTONE in record:
+            self.jobs.pop(record[self.TOMBSTONE], None)
+        elif record.get('id') not in self.jobs:
+            self.jobs[record.get('id')] = Job(record)
+
+    def read_lines(self, offset: int) -> tuple:
+        """Records in the complete lines after offset, and the offset after them"""
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        # A writer may be in the middle of appending the last line
+        end = data.rfind(b'\n') + 1
+        return [json_codec.loads(line) for line in data[:end].splitlines() if line.strip()], offset + end
+
+    def refresh(self):
+        """Read the lines appended since the last read (everything after a compaction)"""
+        with self.lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                self.reset(None)
+                self.apply_pending()
+                return
+            if stat.st_ino == self.inode and stat.st_size == self.offset:
+                return
+            if stat.st_ino != self.inode or stat.st_size < self.offset:
+                self.reset(stat.st_ino)
+
+            records, self.offset = self.read_lines(self.offset)
+            for record in records:
+                self.apply(record)
+                if self.TOMBSTONE not in record:
+                    self.newest = max(self.newest, iso_scraped_at(record))
+            self.apply_pending()
+
+    def apply_pending(self):
+        """Apply the queued (not yet saved) records on top of what was read"""
+        for record in self.pending:
+            if self.TOMBSTONE in record:
+                self.jobs.pop(record[self.TOMBSTONE], None)
+            else:
+                self.jobs[record.get('id')] = record
+
+    def exists(self) -> bool:
+        """Whether any jobs have been stored yet"""
+        return os.path.exists(self.path)
+
+    def version(self) -> Optional[str]:
+        """Changes whenever the log is appended to or compacted (None before the first save)"""
+        return files_version([self.path])
+
+    def all_jobs(self) -> List[Job]:
+        """Every stored job, oldest first"""
+        with self.lock:
+            self.refresh()
+            return [job.copy() for job in self.jobs.values()]
+
+    def count(self) -> int:
+        """Number of stored jobs"""
+        with self.lock:
+            if self.inode is None and not self.pending and self.ids.open():
+                return len(self.ids)
+            self.refresh()
+            return len(self.jobs)
+
+    def known_ids(self, ids: Iterable[str]) -> Set[str]:
+        """Which of ids are already stored (from the ID index while the log isn't loaded)"""
+        with self.lock:
+            if self.inode is None and not self.pending and self.ids.open():
+                return self.ids.known_ids(ids)
+            self.refresh()
+            return {job_id for job_id in ids if job_id in self.jobs}
+
+    def add(self, jobs: List[Dict]):
+        """Queue new jobs to be appended on save (ids already stored are skipped)"""
+        with self.lock:
+            self.refresh()
+            for job in jobs:
+                if job.get('id') not in self.jobs:
+                    record = Job(job)
+                    self.jobs[job.get('id')] = record
+                    self.pending.append(record)
+
+    def replace_all(self, jobs: List[Dict]):
+        """Replace every stored job with jobs (tombstones for the old ones are appended on save)"""
+        with self.lock:
+            self.refresh()
+            self.pending.extend({self.TOMBSTONE: job_id} for job_id in self.jobs)
+            self.jobs = {}
+            self.add(jobs)
+
+    def expire(self, max_age_days: int) -> int:
+        """Remove jobs older than max_age_days (tombstones are appended on save)"""
+        cutoff = datetime.now() - timedelta(days=max_age_days)
+        with self.lock:
+            self.refresh()
+            expired = [job_id for job_id, job in self.jobs.items() if is_expired(job, cutoff)]
+            for job_id in expired:
+                del self.jobs[job_id]
+                self.pending.append({self.TOMBSTONE: job_id})
+        return len(expired)
+
+    def load_index(self) -> List[List]:
+        """[offset, newest scrape time before offset] pairs for the current log"""
+        try:
+            index = json_codec.load(self.index_path)
+            if index['inode'] == os.stat(self.path).st_ino:
+                return index['entries']
+        except (FileNotFoundError, json_codec.JSONDecodeError, KeyError):
+            pass
+        return [[0, '']]
+
+    def save_index(self, entries: List[List], inode: int):
+        """Write the offset index for the log with the given inode"""
+        json_codec.dump({'inode': inode, 'entries': entries}, self.index_path)
+
+    def jobs_since(self, since: datetime) -> List[Job]:
+        """Jobs scraped after since, reading only the tail of the log when it isn't loaded"""
+        with self.lock:
+            if self.inode is not None or not self.exists():
+                self.refresh()
+                return [job.copy() for job in self.jobs.values() if scraped_since(job, since)]
+
+            # Everything before the chosen offset was scraped at or before since
+            entries = self.load_index()
+            position = bisect_right([newest for _, newest in entries], since.isoformat()) - 1
+            records, _ = self.read_lines(entries[max(position, 0)][0])
+
+        jobs = {}
+        for record in records:
+            if self.TOMBSTONE in record:
+                jobs.pop(record[self.TOMBSTONE], None)
+            else:
+                jobs.setdefault(record.get('id'), record)
+        return [Job(job) for job in jobs.values() if scraped_since(job, since)]
+
+    def count_since(self, since: datetime) -> int:
+        """Number of jobs scraped after since"""
+        return len(self.jobs_since(since))
+
+    def by_source(self, source: str) -> List[Job]:
+        """Jobs from one board"""
+        return [job for job in self.all_jobs() if job.get('source') == source]
+
+    def save(self):
+        """Append the queued jobs and tombstones (compacting the log if it is mostly dead lines), and the ID index"""
+        with self.lock:
+            # The ID index can only be edited while it still matches the log
+            if self.ids.open():
+                ids = self.ids.updated({record.get(self.TOMBSTONE, record.get('id')): self.TOMBSTONE not in record
+                                        for record in self.pending})
+            else:
+                ids = None
+            self.refresh()
+
+            if self.pending:
+                entries = self.load_index() if self.exists() else [[0, '']]
+                if self.offset > entries[-1][0]:
+                    entries.append([self.offset, self.newest])
+
+                data = b''.join(json_codec.dumps(record, default=to_dict) + b'\n' for record in self.pending)
+                with open(self.path, 'ab') as f:
+                    f.write(data)
+                self.inode = os.stat(self.path).st_ino
+                self.offset += len(data)
+                self.lines += len(self.pending)
+                for record in self.pending:
+                    if self.TOMBSTONE not in record:
+                        self.newest = max(self.newest, iso_scraped_at(record))
+                self.pending = []
+                self.save_index(entries, self.inode)
+
+            dead = self.lines - len(self.jobs)
+            if dead > max(self.COMPACT_MIN_DEAD, self.compact_ratio * len(self.jobs)):
+                self.compact()
+            self.ids.write(ids if ids is not None else sorted_digests(self.jobs))
+
+    def compact(self):
+        """Rewrite the log with only the live jobs"""
+        with self.lock:
+            self.refresh()
+            tmp_path = self.path + '.tmp'
+            entries, offset, newest = [], 0, ''
+            with open(tmp_path, 'wb') as f:
+                for i, job in enumerate(self.jobs.values()):
+                    if i % self.INDEX_EVERY == 0:
+                        entries.append([offset, newest])
+                    line = json_codec.dumps(job.to_dict()) + b'\n'
+                    f.write(line)
+                    offset += len(line)
+                    newest = max(newest, iso_scraped_at(job))
+            inode = os.stat(tmp_path).st_ino
+            self.save_index(entries or [[0, '']], inode)
+            os.replace(tmp_path, self.path)
+            self.inode, self.offset, self.lines, self.newest = inode, offset, len(self.jobs), newest
+
+    def close(self):
+        """Release the store (unmaps the ID index; the log is opened per read)"""
+        self.ids.close()
+
+
+class DailyJobStore:
+    """Jobs split into one JSON file per scrape day (jobs/2026-10-17.json)
+
+    Expiry deletes the files of days that are entirely too old and only
+    checks the jobs of the day the cutoff falls on, and jobs_since() reads
+    only the days it covers. Each day is a JsonJobStore with its own ID
+    index, so deduplication doesn't load any of them. Jobs without a
+    readable scrape date go in undated.json and are kept, as in the other
+    stores.
+    """
+
+    def __init__(self, directory: str, pretty: bool = False):
+        """Store backed by the day files in directory"""
+        self.directory = directory
+        self.pretty = pretty
+        self.shards = {}
+
+    @property
+    def location(self) -> str:
+        """Where the jobs are kept"""
+        return self.directory
+
+    def days(self) -> List[str]:
+        """Days with jobs, oldest first (undated first of all)"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            names = []
+        days = {match.group(1) for match in map(DAY_FILE.match, names) if match}
+        return sorted(days | set(self.shards), key=lambda day: (day != UNDATED, day))
+
+    def shard(self, day: str) -> JsonJobStore:
+        """The store for one day"""
+        if day not in self.shards:
+            self.shards[day] = JsonJobStore(os.path.join(self.directory, day + '.json'), self.pretty)
+        return self.shards[day]
+
+    def drop(self, day: str):
+        """Delete a day's file and ID index"""
+        shard = self.shard(day)
+        del self.shards[day]
+        shard.close()
+        for path in (shard.path, shard.ids.path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def exists(self) -> bool:
+        """Whether any jobs have been stored yet"""
+        return any(self.shard(day).exists() for day in self.days())
+
+    def version(self) -> Optional[str]:
+        """Changes whenever a day file is saved or dropped (None before the first save)"""
+        return files_version(os.path.join(self.directory, day + '.json') for day in self.days())
+
+    def all_jobs(self) -> List[Job]:
+        """Every stored job, oldest day first"""
+        return [job for day in self.days() for job in self.shard(day).all_jobs()]
+
+    def count(self) -> int:
+        """Number of stored jobs"""
+        return sum(self.shard(day).count() for day in self.days())
+
+    def known_ids(self, ids: Iterable[str]) -> Set[str]:
+        """Which of ids are already stored"""
+        ids = list(ids)
+        known = set()
+        for day in self.days():
+            known |= self.shard(day).known_ids(ids)
+        return known
+
+    def add(self, jobs: List[Dict]):
+        """Store new jobs in the files of the days they were scraped"""
+        for day, day_jobs in jobs_by_day(jobs).items():
+            self.shard(day).add(day_jobs)
+
+    def replace_all(self, jobs: List[Dict]):
+        """Replace every stored job with jobs"""
+        by_day = jobs_by_day(jobs)
+        for day in self.days():
+            self.shard(day).replace_all(by_day.pop(day, []))
+        self.add([job for day_jobs in by_day.values() for job in day_jobs])
+
+    def expire(self, max_age_days: int) -> int:
+        """Delete jobs older than max_age_days, returning how many were deleted"""
+        cutoff_day = (datetime.now() - timedelta(days=max_age_days)).date().isoformat()
+        removed = 0
+        for day in self.days():
+            if day == UNDATED or day > cutoff_day:
+                continue
+            if day < cutoff_day:
+                removed += self.shard(day).count()
+                self.drop(day)
+            else:
+                removed += self.shard(day).expire(max_age_days)
+        return removed
+
+    def jobs_since(self, since: datetime) -> List[Job]:
+        """Jobs scraped after since, reading only the days from since on"""
+        first_day = since.date().isoformat()
+        return [job for day in self.days() if day != UNDATED and day >= first_day
+                for job in self.shard(day).jobs_since(since)]
+
+    def count_since(self, since: datetime) -> int:
+        """Number of jobs scraped after since"""
+        return len(self.jobs_since(since))
+
+    def by_source(self, source: str) -> List[Job]:
+        """Jobs from one board"""
+        return [job for job in self.all_jobs() if job.get('source') == source]
+
+    def save(self):
+        """Write the days that changed, deleting those left empty"""
+        os.makedirs(self.directory, exist_ok=True)
+        for day, shard in list(self.shards.items()):
+            if shard.jobs is not None and not shard.jobs:
+                self.drop(day)
+            else:
+                shard.save()
+
+    def close(self):
+        """Release the store (unmaps the days' ID indexes)"""
+        for shard in self.shards.values():
+            shard.close()
+
+
+class SqliteJobStore:
+    """Jobs in a SQLite table indexed by id, source and scraped_at
+
+    Each job is one row; keys beyond JOB_FIELDS (employment_type,
+    department, ...) are kept as JSON in the extra column, so jobs come back
+    exactly as they were stored. A job id is stored once, with the time it
+    was first scraped.
+    """
+
+    def __init__(self, path: str):
+        """Open (or create) the database at path"""
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                title TEXT, company TEXT, location TEXT, description TEXT, url TEXT,
+                date_posted TEXT, source TEXT, scraped_at TEXT, extra TEXT
+            );
+            CREATE INDEX IF NOT EXISTS jobs_source ON jobs (source);
+            CREATE INDEX IF NOT EXISTS jobs_scraped_at ON jobs (scraped_at);
+        ''')
+
+    @property
+    def location(self) -> str:
+        """Where the jobs are kept"""
+        return self.path
+
+    def exists(self) -> bool:
+        """Whether any jobs have been stored yet"""
+        return self.count() > 0
+
+    def row_to_job(self, row) -> Job:
+        """Job from a (title, ..., id, extra) row"""
+        job = {field: value for field, value in zip(JOB_FIELDS, row) if value is not None}
+        if row[-1]:
+            job.update(json_codec.loads(row[-1]))
+        return Job(job)
+
+    def query(self, where: str = '', params: tuple = ()) -> List[Job]:
+        """Jobs matching a WHERE clause, oldest first"""
+        rows = self.db.execute(f"SELECT {', '.join(JOB_FIELDS)}, extra FROM jobs {where} ORDER BY rowid",
+                               params)
+        return [self.row_to_job(row) for row in rows]
+
+    def all_jobs(self) -> List[Job]:
+        """Every stored job, oldest first"""
+        return self.query()
+
+    def count(self) -> int:
+        """Number of stored jobs"""
+        return self.db.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    def known_ids(self, ids: Iterable[str]) -> Set[str]:
+        """Which of ids are already stored (primary key lookups)"""
+        ids = list(ids)
+        known = set()
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = self.db.execute(f"SELECT id FROM jobs WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+            known.update(row[0] for row in rows)
+        return known
+
+    def insert(self, jobs: List[Dict]):
+        """INSERT jobs in the current transaction (ids already stored keep their first row)"""
+        rows = []
+        for job in jobs:
+            extra = {key: value for key, value in job.items() if key not in JOB_FIELDS}
+            rows.append(tuple(job.get(field) for field in JOB_FIELDS)
+                        + (json_codec.dumps(extra).decode() if extra else None,))
+        self.db.executemany(f"INSERT OR IGNORE INTO jobs ({', '.join(JOB_FIELDS)}, extra) "
+                            f"VALUES ({', '.join('?' * (len(JOB_FIELDS) + 1))})", rows)
+
+    def add(self, jobs: List[Dict]):
+        """Store new jobs (ids already stored keep their first row)"""
+        with self.db:
+            self.insert(jobs)
+
+    def replace_all(self, jobs: List[Dict]):
+        """Replace every stored job with jobs, in one transaction"""
+        with self.db:
+            self.db.execute('DELETE FROM jobs')
+            self.insert(jobs)
+
+    def expire(self, max_age_days: int) -> int:
+        """Delete jobs older than max_age_days, returning how many were deleted"""
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+        with self.db:
+            # Like is_expired, rows without a readable date are kept
+            cursor = self.db.execute(f'DELETE FROM jobs WHERE scraped_at <= ? AND {ISO_SCRAPED_AT}',
+                                     (cutoff,))
+        return cursor.rowcount
+
+    def jobs_since(self, since: datetime) -> List[Job]:
+        """Jobs scraped after since"""
+        return self.query(f'WHERE scraped_at > ? AND {ISO_SCRAPED_AT}', (since.isoformat(),))
+
+    def count_since(self, since: datetime) -> int:
+        """Number of jobs scraped after since"""
+        return self.db.execute(f'SELECT COUNT(*) FROM jobs WHERE scraped_at > ? AND {ISO_SCRAPED_AT}',
+                               (since.isoformat(),)).fetchone()[0]
+
+    def version(self) -> Optional[str]:
+        """Changes whenever a change is committed to the database"""
+        return files_version([self.path, self.path + '-wal'])
+
+    def by_source(self, source: str) -> List[Job]:
+        """Jobs from one board"""
+        return self.query('WHERE source = ?', (source,))
+
+    def save(self):
+        """Nothing to do: every change is committed as it is made"""
+
+    def close(self):
+        """Close the database connection"""
+        self.db.close()
+
+
+def open_store(settings: Dict, base_dir: str, storage: Optional[str] = None):
+    """Job store selected by settings.storage (or storage), with paths relative to base_dir"""
+    storage = storage or settings.get('storage', 'json')
+    if storage == 'jsonl':
+        path = os.path.join(base_dir, settings.get('jsonl_file', 'jobs.jsonl'))
+        # Kept open per file, so later reads in this process only read new lines
+        if path not in _jsonl_stores:
+            _jsonl_stores[path] = JsonlJobStore(path, settings.get('compact_ratio', 1.0))
+        return _jsonl_stores[path]
+    if storage == 'daily':
+        return DailyJobStore(os.path.join(base_dir, settings.get('jobs_dir', 'jobs')),
+                             pretty=settings.get('pretty_json', False))
+    if storage == 'sqlite':
+        return SqliteJobStore(os.path.join(base_dir, settings.get('database', 'jobs.db')))
+    if storage != 'json':
+        print(f"Warning: Unknown storage '{storage}', using json")
+    return JsonJobStore(os.path.join(base_dir, settings.get('output_file', 'jobs.json')),
+                        pretty=settings.get('pretty_json', False))
+
+
+def configured_store(base_dir: str = '.'):
+    """Job store configured in base_dir/config.json (jobs.json if there is no config)"""
+    try:
+        settings = json_codec.load(os.path.join(base_dir, 'config.json')).get('settings', {})
+    except (FileNotFoundError, json_codec.JSONDecodeError):
+        settings = {}
+    return open_store(settings, base_dir)
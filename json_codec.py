@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+JSON codec for jobs.json
+Uses orjson when it is installed (pip3 install orjson) and the standard
+library otherwise. Both write compact UTF-8 by default, so files written by
+either can be read by the other.
+"""
+
+import json
+import os
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+# Raised for invalid JSON by either backend (orjson's error subclasses it)
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, pretty: bool = False, default: Optional[Callable] = None) -> bytes:
+    """Encode obj as UTF-8 JSON, compact unless pretty (2-space indent)
+
+    default converts objects JSON can't represent, as in json.dumps.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=default).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=default).encode('utf-8')
+
+
+def load(path: str) -> Any:
+    """Read a JSON file (raises FileNotFoundError / JSONDecodeError)"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def dump(obj: Any, path: str, pretty: bool = False, default: Optional[Callable] = None):
+    """Write obj to a JSON file, replacing it atomically"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(dumps(obj, pretty, default))
+    os.replace(tmp_path, path)
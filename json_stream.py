@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON array extraction
+Feed a JSON document (or a page with JSON embedded after a marker) chunk by
+chunk as it downloads, and get back the items of one array inside it as
+soon as each item is complete.
+"""
+
+import codecs
+import json
+import re
+from json.decoder import scanstring
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Characters that can follow a complete value (anything else may continue a number)
+VALUE_END = frozenset(' \t\n\r,]}')
+
+
+class NeedMoreData(Exception):
+    """The buffered text ends in the middle of a token"""
+
+
+def is_cut_number(value, buffer: str, end: int) -> bool:
+    """Whether value is a number decoded from a prefix of one (e.g. '-2500' of '-2500.0')"""
+    return isinstance(value, (int, float)) and end < len(buffer) and buffer[end] not in VALUE_END
+
+
+class JsonArrayStream:
+    """Push parser yielding the items of the array at one of several key paths
+
+    Only the objects on the way to a wanted path are walked key by key; every
+    other value is skipped with the C JSON decoder, and the wanted array is
+    decoded one item at a time. Memory therefore stays proportional to the
+    largest single value rather than to the document. Arrays are only
+    descended into when they are the wanted array, so paths are made of
+    object keys. The first wanted path found wins.
+
+    Values at the capture paths (e.g. a next-page cursor) are decoded whole
+    into .captured, before or after the array.
+    """
+
+    def __init__(self, paths: Iterable[Sequence[str]], capture: Iterable[Sequence[str]] = ()):
+        """Stream the array at the first of paths (tuples of object keys) found"""
+        self.paths = {tuple(path) for path in paths}
+        self.capture = {tuple(path) for path in capture}
+        self.prefixes = {path[:i] for path in self.paths | self.capture for i in range(len(path))}
+        self.captured = {}
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.retry_size = 0
+        # Frames are [kind ('obj'/'arr'), current key, state]
+        self.stack = []
+        self.root_state = 'value'
+        self.found = False
+        self.array_closed = False
+        self.done = False
+
+    def feed(self, text: str, final: bool = False) -> List:
+        """Add text to the document, returning the array items completed by it"""
+        items = []
+        if self.done:
+            return items
+
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        if not final and len(self.buffer) < self.retry_size:
+            return items
+
+        try:
+            self._parse(items, final)
+            self.retry_size = 0
+        except NeedMoreData:
+            if final:
+                raise ValueError('JSON document ended before the wanted array was complete')
+            # Don't re-scan a large incomplete value until much more text has arrived
+            self.retry_size = 2 * (len(self.buffer) - self.pos)
+        return items
+
+    def close(self) -> List:
+        """Signal the end of the document, returning any remaining items"""
+        return self.feed('', final=True)
+
+    def _path(self) -> Tuple[str, ...]:
+        """Object keys leading to the value about to be read"""
+        return tuple(frame[1] for frame in self.stack)
+
+    def _skip_whitespace(self) -> str:
+        """Advance past whitespace and return the next character"""
+        pos = self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+        if pos == len(self.buffer):
+            raise NeedMoreData()
+        return self.buffer[pos]
+
+    def _decode_value(self, final: bool):
+        """Decode the complete value at the current position"""
+        try:
+            value, end = self.decoder.raw_decode(self.buffer, self.pos)
+        except ValueError:
+            if final:
+                raise
+            raise NeedMoreData()
+        # A number at the very end of the buffer (or cut after '.', 'e' or '-') may still be growing
+        if not final and (end == len(self.buffer) or is_cut_number(value, self.buffer, end)):
+            raise NeedMoreData()
+        self.pos = end
+        return value
+
+    def _value_done(self):
+        """Move the enclosing container (or the document) past a finished value"""
+        if self.stack:
+            self.stack[-1][2] = 'comma'
+        else:
+            self.done = True
+        if self.array_closed and len(self.captured) == len(self.capture):
+            self.done = True
+
+    def _pop(self):
+        """Close the innermost container"""
+        frame = self.stack.pop()
+        self.pos += 1
+        if frame[0] == 'arr':
+            # Only the wanted array is ever pushed
+            self.array_closed = True
+        self._value_done()
+
+    def _read_items(self, items: List, final: bool):
+        """Decode consecutive items of the wanted array (the hot loop)"""
+        frame, buffer, decode = self.stack[-1], self.buffer, self.decoder.raw_decode
+        while True:
+            try:
+                item, end = decode(buffer, self.pos)
+            except ValueError:
+                if final:
+                    raise
+                raise NeedMoreData()
+            # Only a following ',' or ']' proves a number at the end of the buffer is complete
+            if not final and is_cut_number(item, buffer, end):
+                raise NeedMoreData()
+            end = WHITESPACE.match(buffer, end).end()
+            if end == len(buffer) and not final:
+                raise NeedMoreData()
+            items.append(item)
+            self.pos = end
+            if end == len(buffer) or buffer[end] != ',':
+                frame[2] = 'comma'
+                return
+            self.pos = WHITESPACE.match(buffer, end + 1).end()
+            if self.pos == len(buffer):
+                frame[2] = 'value'
+                raise NeedMoreData()
+
+    def _parse(self, items: List, final: bool):
+        """Consume as much of the buffer as possible"""
+        while not self.done:
+            char = self._skip_whitespace()
+            frame = self.stack[-1] if self.stack else None
+            state = frame[2] if frame else self.root_state
+
+            if state == 'value' or state == 'value_or_end':
+                if state == 'value_or_end' and char == ']':
+                    self._pop()
+                elif frame and frame[0] == 'arr':
+                    self._read_items(items, final)
+                else:
+                    path = self._path()
+                    if path in self.capture:
+                        self.captured[path] = self._decode_value(final)
+                        self._value_done()
+                    elif char == '[' and path in self.paths and not self.found:
+                        self.stack.append(['arr', None, 'value_or_end'])
+                        self.found = True
+                        self.pos += 1
+                    elif char == '{' and path in self.prefixes:
+                        self.stack.append(['obj', None, 'key_or_end'])
+                        self.pos += 1
+                    else:
+                        self._decode_value(final)
+                        self._value_done()
+
+            elif state == 'key_or_end' or state == 'key':
+                if state == 'key_or_end' and char == '}':
+                    self._pop()
+                elif char == '"':
+                    try:
+                        key, end = scanstring(self.buffer, self.pos + 1)
+                    except ValueError:
+                        raise NeedMoreData()
+                    frame[1] = key
+                    frame[2] = 'colon'
+                    self.pos = end
+                else:
+                    raise ValueError(f"Expected an object key at position {self.pos}")
+
+            elif state == 'colon':
+                if char != ':':
+                    raise ValueError(f"Expected ':' at position {self.pos}")
+                frame[2] = 'value'
+                self.pos += 1
+
+            elif state == 'comma':
+                if char == ',':
+                    frame[2] = 'value' if frame[0] == 'arr' else 'key'
+                    self.pos += 1
+                elif char in ']}':
+                    self._pop()
+                else:
+                    raise ValueError(f"Expected ',' at position {self.pos}")
+
+
+class EmbeddedJsonStream:
+    """JsonArrayStream over raw bytes, starting after a marker (e.g. a <script> tag)"""
+
+    def __init__(self, paths: Iterable[Sequence[str]], start_marker: bytes = b'',
+                 encoding: str = 'utf-8', capture: Iterable[Sequence[str]] = ()):
+        """Stream the array at paths in the JSON that follows start_marker"""
+        self.array = JsonArrayStream(paths, capture)
+        self.marker = start_marker
+        self.pending = b''
+        self.started = not start_marker
+        self.text_decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+    @property
+    def found(self) -> bool:
+        """Whether one of the wanted arrays was reached"""
+        return self.array.found
+
+    @property
+    def captured(self) -> Dict:
+        """Values found at the capture paths, keyed by path"""
+        return self.array.captured
+
+    @property
+    def done(self) -> bool:
+        """Whether the wanted array (and every captured value) has been read"""
+        return self.array.done
+
+    def feed(self, chunk: bytes) -> List:
+        """Add downloaded bytes, returning the array items completed by them"""
+        if not self.started:
+            data = self.pending + chunk
+            start = data.find(self.marker)
+            if start < 0:
+                self.pending = data[-(len(self.marker) - 1):] if len(self.marker) > 1 else b''
+                return []
+            self.started = True
+            self.pending = b''
+            chunk = data[start + len(self.marker):]
+        return self.array.feed(self.text_decoder.decode(chunk))
+
+    def close(self) -> List:
+        """Signal the end of the download, returning any remaining items"""
+        if not self.started or self.array.done:
+            return []
+        return self.array.feed(self.text_decoder.decode(b'', final=True), final=True)
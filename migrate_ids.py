@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Rewrite stored job IDs to the current scheme (see job_ids)
+
+    python3 migrate_ids.py              # rewrite the IDs in the configured storage
+    python3 migrate_ids.py --dry-run    # only count what would change
+
+Jobs from Greenhouse, Lever, Ashby and Next.js boards get their native_id
+from their URL, which holds the same platform ID the scraper now reads
+from the payloads (Lever and Ashby URLs only when they hold the posting's
+UUID); other jobs are re-keyed on title, company and URL.
+Stored copies of the same posting (e.g. after a title edit) are merged,
+keeping the oldest. The jobs kept in the board state file are rewritten too, so
+the next run doesn't see any stored job as new. Running it again changes
+nothing.
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict, List, Tuple
+
+import json_codec
+from board_state import BoardState
+from job_ids import NATIVE_ID_PATTERNS, job_id, job_set_fingerprint, native_id
+from job_store import open_store
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def migrated(job, board_type: str) -> Dict:
+    """A copy of job with the native_id its URL gives and its current ID"""
+    fields = {key: value for key, value in job.items() if key != 'id'}
+    if board_type in NATIVE_ID_PATTERNS and not fields.get('native_id'):
+        native = native_id(board_type, url=fields.get('url', ''))
+        if native:
+            fields['native_id'] = native
+    fields['id'] = job_id(fields)
+    return fields
+
+
+def migrate_jobs(jobs: List, board_types: Dict[str, str]) -> Tuple[List[Dict], int]:
+    """Migrated jobs (the first of any that end up with the same ID) and how many IDs changed"""
+    by_id, changed = {}, 0
+    for job in jobs:
+        new_job = migrated(job, board_types.get(job.get('source'), ''))
+        changed += new_job['id'] != job['id']
+        by_id.setdefault(new_job['id'], new_job)
+    return list(by_id.values()), changed
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Rewrite stored job IDs to the current scheme')
+    parser.add_argument('--dry-run', action='store_true', help='only count what would change')
+    args = parser.parse_args()
+
+    config_path = os.path.join(BASE_DIR, 'config.json')
+    try:
+        config = json_codec.load(config_path)
+    except FileNotFoundError:
+        config = {}
+    except json_codec.JSONDecodeError:
+        # Without the board types every job would be re-keyed on title, company and URL
+        print(f"Error: Invalid JSON in {config_path}")
+        sys.exit(1)
+    settings = config.get('settings', {})
+    boards = config.get('job_boards', [])
+    board_types = {board.get('name'): board.get('type', 'generic').lower() for board in boards}
+
+    store = open_store(settings, BASE_DIR)
+    if not store.exists():
+        print(f"No jobs found in {store.location}")
+        return
+    jobs = store.all_jobs()
+    new_jobs, changed = migrate_jobs(jobs, board_types)
+    merged = len(jobs) - len(new_jobs)
+    with_native = sum(1 for job in new_jobs if job.get('native_id'))
+    print(f"{changed} of {len(jobs)} job IDs {'would change' if args.dry_run else 'changed'}, "
+          f"{merged} duplicates merged, {with_native} jobs have a native ID")
+    if args.dry_run or (not changed and not merged):
+        store.close()
+        return
+    store.replace_all(new_jobs)
+    store.save()
+    store.close()
+
+    # Jobs reused for unchanged pages, and the job sets the adaptive schedule compares
+    state = BoardState(os.path.join(BASE_DIR, settings.get('state_file', 'board_state.json')))
+    types_by_url = {board.get('url'): board.get('type', 'generic').lower() for board in boards}
+    for board_url, board_state in state.boards.items():
+        if 'jobs' not in board_state:
+            continue
+        board_jobs = [migrated(job, types_by_url.get(board_url, '')) for job in board_state['jobs']]
+        fields = {'jobs': board_jobs}
+        if 'schedule' in board_state:
+            fields['schedule'] = dict(board_state['schedule'], job_set=job_set_fingerprint(board_jobs))
+        state.update(board_url, **fields)
+    state.save()
+    print(f"Saved {len(new_jobs)} jobs to {store.location}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Copy stored jobs from one storage backend to another
+
+    python3 migrate_jobs.py sqlite                  # jobs.json -> jobs.db
+    python3 migrate_jobs.py json --source sqlite    # and back
+    python3 migrate_jobs.py jsonl                   # jobs.json -> jobs.jsonl
+    python3 migrate_jobs.py daily                   # jobs.json -> jobs/<day>.json
+
+Jobs already in the target are left alone, so it is safe to run twice.
+"""
+
+import argparse
+import os
+import sys
+
+import json_codec
+from job_store import STORAGE_BACKENDS, open_store
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Copy stored jobs between storage backends')
+    parser.add_argument('target', choices=STORAGE_BACKENDS, help='storage to copy the jobs into')
+    parser.add_argument('--source', choices=STORAGE_BACKENDS, default='json',
+                        help='storage to copy the jobs from (default: json)')
+    args = parser.parse_args()
+
+    if args.source == args.target:
+        parser.error('source and target storage are the same')
+
+    config_path = os.path.join(BASE_DIR, 'config.json')
+    try:
+        settings = json_codec.load(config_path).get('settings', {})
+    except FileNotFoundError:
+        settings = {}
+    except json_codec.JSONDecodeError:
+        # Copying under the default settings could fill the wrong files
+        print(f"Error: Invalid JSON in {config_path}")
+        sys.exit(1)
+
+    source = open_store(settings, BASE_DIR, args.source)
+    try:
+        if not source.exists():
+            print(f"No jobs found in {source.location}")
+            return
+        jobs = source.all_jobs()
+    finally:
+        source.close()
+
+    target = open_store(settings, BASE_DIR, args.target)
+    try:
+        known_ids = target.known_ids(job['id'] for job in jobs)
+        new_jobs = [job for job in jobs if job['id'] not in known_ids]
+        target.add(new_jobs)
+        target.save()
+    finally:
+        target.close()
+
+    print(f"Copied {len(new_jobs)} of {len(jobs)} jobs from {source.location} to {target.location}")
+    if settings.get('storage', 'json') != args.target:
+        print(f'Set "storage": "{args.target}" in the settings of config.json to use it')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP response cache
+Response bodies are stored once per content hash under cache/objects/, and
+cache/index.json maps each URL to its latest body, status and headers.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+
+# Response headers kept with a cached body
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+# Error statuses worth caching: a missing JSON endpoint is as stable as a page (5xx and 429 never are)
+CACHED_ERROR_STATUSES = (404,)
+
+
+class CacheMiss(Exception):
+    """Raised in replay mode when a URL has never been cached"""
+
+
+class ResponseCache:
+    """Content-addressed response bodies with a URL index"""
+
+    def __init__(self, directory: str):
+        """Open (or create) the cache in directory"""
+        self.directory = directory
+        self.objects_dir = os.path.join(directory, 'objects')
+        self.index_path = os.path.join(directory, 'index.json')
+        self.lock = threading.Lock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.index = self.load_index()
+
+    def load_index(self) -> Dict:
+        """Load the URL index"""
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, OSError):
+                print(f"Warning: Could not read {self.index_path}, starting with an empty cache")
+        return {}
+
+    def object_path(self, digest: str) -> str:
+        """Path of the body with the given sha256 digest"""
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def get(self, url: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """Cached entry for url (with its body), or None if missing or older than max_age seconds"""
+        with self.lock:
+            entry = self.index.get(url)
+        if entry is None:
+            return None
+        if max_age is not None and time.time() - entry['fetched_at'] > max_age:
+            return None
+
+        try:
+            with open(self.object_path(entry['sha256']), 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        return dict(entry, body=body)
+
+    def put(self, url: str, status: int, headers, body: bytes):
+        """Store a response body and point url at it (only successful responses and 404s)"""
+        if not (200 <= status < 300 or status in CACHED_ERROR_STATUSES):
+            return
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+
+        entry = {
+            'sha256': digest,
+            'status': status,
+            'headers': {name: headers[name] for name in CACHED_HEADERS if headers.get(name)},
+            'fetched_at': time.time(),
+        }
+        with self.lock:
+            self.index[url] = entry
+
+    def touch(self, url: str):
+        """Mark a cached entry as fresh (e.g. after a 304 Not Modified)"""
+        with self.lock:
+            if url in self.index:
+                self.index[url]['fetched_at'] = time.time()
+
+    def save(self):
+        """Write the index and delete bodies no URL points to any more"""
+        with self.lock:
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self.index, f)
+            os.replace(tmp_path, self.index_path)
+            referenced = {entry['sha256'] for entry in self.index.values()}
+
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            for name in os.listdir(prefix_dir):
+                if name not in referenced:
+                    os.remove(os.path.join(prefix_dir, name))
@@ -4,6 +4,7 @@ Job Board Scraper
 Runs twice a day to fetch new job postings from configured job boards
 """
 
+import argparse
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
@@ -11,20 +12,93 @@ import json
 import os
 import hashlib
 import re
-from urllib.parse import urljoin
-from typing import List, Dict, Optional
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+from typing import Callable, List, Dict, Optional, Tuple
+
+from board_state import BoardState
+from description_store import open_descriptions
+from enrichment import DetailEnricher, TRUNCATED_LENGTH
+from exports import CsvSink, TitlesSink, columnar_sink, export_jobs
+from html_backends import CompiledSelector, compile_selectors, parse_html, soup_backend
+from http_session import create_session, USER_AGENT
+from job_ids import job_id, job_set_fingerprint, native_id
+from job_store import open_store
+from json_stream import EmbeddedJsonStream
+from response_cache import ResponseCache, CacheMiss
+
+
+# Assignment of the JSON blob embedded in Ashby pages
+APP_DATA_ASSIGNMENT = re.compile(rb'window\.__appData\s*=\s*')
+
+# Opening tag of the JSON blob embedded in Next.js pages, and where the jobs are inside it
+NEXT_DATA_SCRIPT = b'<script id="__NEXT_DATA__" type="application/json">'
+NEXT_DATA_JOB_PATHS = [('props', 'pageProps', 'list'), ('props', 'pageProps', 'jobs')]
+
+# Bytes read at a time when streaming a response
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Statuses saying a board has no JSON endpoint (other errors may be a passing outage)
+MISSING_ENDPOINT_STATUSES = (404, 410)
+
+# Board keys that don't change the jobs parsed from a response, and the settings that do
+UNPARSED_BOARD_KEYS = ('enabled', 'cache_ttl', 'detail_selector')
+PARSE_SETTINGS = ('parser', 'scoped_parse', 'full_descriptions')
+
+
+def json_path(path: str) -> Tuple[str, ...]:
+    """Object keys of a dotted JSON path ('' for the document itself)"""
+    return tuple(path.split('.')) if path else ()
+
+
+def lookup(data, path: Tuple[str, ...]):
+    """Value at a path of object keys, or None if any key is missing"""
+    for key in path:
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data
 
 
 class JobScraper:
     """Main job scraper class that handles different job board types"""
 
-    def __init__(self, config_path='config.json'):
-        """Initialize scraper with configuration"""
+    def __init__(self, config_path='config.json', replay=False, scrape_all=False):
+        """Initialize scraper with configuration
+
+        With replay=True every response is served from the response cache
+        and nothing is fetched from the network. scrape_all=True ignores the
+        adaptive schedule and scrapes every enabled board.
+        """
         self.config_path = os.path.join(os.path.dirname(__file__), config_path)
         self.config = self.load_config()
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+            'User-Agent': USER_AGENT
         }
+        settings = self.config.get('settings', {})
+        self.session = create_session(settings)
+        self.async_connection_stats = {}
+        # URLs of boards whose scrape failed this run
+        self.failed_boards = set()
+        self.state = BoardState(os.path.join(
+            os.path.dirname(__file__),
+            settings.get('state_file', 'board_state.json')
+        ))
+
+        # Listing descriptions are cut short unless the full text goes to the description store
+        self.description_limit = None if settings.get('full_descriptions', False) else TRUNCATED_LENGTH
+
+        self.replay = replay
+        self.scrape_all = scrape_all or replay
+        self.cache = None
+        cache_enabled = (replay or settings.get('response_cache', False) or settings.get('cache_ttl')
+                         or any(board.get('cache_ttl') for board in self.config.get('job_boards', [])))
+        if cache_enabled:
+            self.cache = ResponseCache(os.path.join(
+                os.path.dirname(__file__),
+                settings.get('cache_dir', 'cache')
+            ))
 
     def load_config(self) -> Dict:
         """Load configuration from config.json"""
@@ -39,358 +113,737 @@ class JobScraper:
             return {"job_boards": [], "settings": {}}
 
     def generate_job_id(self, job: Dict) -> str:
-        """Generate unique ID for a job posting"""
-        unique_string = f"{job.get('title', '')}{job.get('company', '')}{job.get('url', '')}"
-        return hashlib.md5(unique_string.encode()).hexdigest()
+        """Generate unique ID for a job posting (see job_ids)"""
+        return job_id(job)
+
+    def board_config_hash(self, board: Dict) -> str:
+        """Hash of everything that decides how a board's jobs are parsed (its config and parser settings)"""
+        settings = self.config.get('settings', {})
+        config = {
+            'board': {key: value for key, value in board.items() if key not in UNPARSED_BOARD_KEYS},
+            'settings': {key: settings.get(key) for key in PARSE_SETTINGS},
+        }
+        return hashlib.md5(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+    def conditional_headers(self, board: Dict, url: str) -> Dict:
+        """If-None-Match/If-Modified-Since headers from the board's last run
+
+        None when the board's config changed since then, as a 304 would
+        reuse jobs parsed under the old config.
+        """
+        state = self.state.get(board['url'])
+        validators = state.get('validators', {}).get(url)
+        if not validators or 'jobs' not in state or state.get('config') != self.board_config_hash(board):
+            return {}
+
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def remember_jobs(self, board: Dict, url: str, response_headers, jobs: List[Dict],
+                      fingerprint: str = ''):
+        """Store the jobs parsed from url with the response validators, payload fingerprint and board config"""
+        validators = {
+            'etag': response_headers.get('ETag', ''),
+            'last_modified': response_headers.get('Last-Modified', ''),
+        }
+        has_validators = validators['etag'] or validators['last_modified']
+        self.state.update(
+            board['url'],
+            jobs=jobs,
+            validators={url: validators} if has_validators else {},
+            fingerprint={url: fingerprint} if fingerprint else {},
+            config=self.board_config_hash(board),
+        )
+
+    def reuse_jobs(self, board: Dict, reason: str = 'not modified') -> List[Dict]:
+        """Jobs from the board's last run, after a 304 Not Modified or an unchanged payload"""
+        now = datetime.now().isoformat()
+        jobs = [dict(job, scraped_at=now) for job in self.state.get(board['url']).get('jobs', [])]
+        print(f"  {board['name']} {reason}, reusing {len(jobs)} jobs")
+        return jobs
+
+    def parse_once(self, board: Dict, url: str, response_headers, payload: bytes,
+                   parse: Callable[[], List[Dict]]) -> List[Dict]:
+        """Run parse() unless payload is identical to the one behind the stored jobs
+
+        payload is whatever the jobs are extracted from (the response body, or
+        the embedded JSON blob for Next.js pages); its hash is compared with the
+        last run's before any JSON/HTML parsing happens. Jobs parsed under a
+        different board config are never reused.
+        """
+        fingerprint = hashlib.md5(payload).hexdigest()
+        state = self.state.get(board['url'])
+        if ('jobs' in state and state.get('fingerprint', {}).get(url) == fingerprint
+                and state.get('config') == self.board_config_hash(board)):
+            return self.reuse_jobs(board, 'unchanged')
+
+        jobs = parse()
+        self.remember_jobs(board, url, response_headers, jobs, fingerprint)
+        return jobs
+
+    def choose_endpoint(self, board: Dict) -> str:
+        """Endpoint ('json' or 'html') to try first for a Greenhouse/Lever board
+
+        Boards whose JSON endpoint failed last time go straight to HTML,
+        except every settings.reprobe_every runs when JSON is tried again.
+        """
+        endpoint = self.state.get(board['url']).get('endpoint')
+        if not endpoint or endpoint['strategy'] == 'json':
+            return 'json'
+
+        reprobe_every = max(1, int(self.config.get('settings', {}).get('reprobe_every', 10)))
+        runs_since_probe = endpoint.get('runs_since_probe', 0) + 1
+        if runs_since_probe >= reprobe_every:
+            return 'json'
+        self.state.update(board['url'], endpoint=dict(endpoint, runs_since_probe=runs_since_probe))
+        return 'html'
+
+    def remember_endpoint(self, board: Dict, strategy: str):
+        """Record which endpoint ('json' or 'html') worked for a board"""
+        self.state.update(board['url'], endpoint={'strategy': strategy, 'runs_since_probe': 0})
+
+    def cached_response(self, board: Dict, url: str) -> Optional[Dict]:
+        """Response cache entry to serve instead of fetching url, if any"""
+        if self.cache is None:
+            return None
+        if self.replay:
+            entry = self.cache.get(url)
+            if entry is None:
+                raise CacheMiss(f"{url} is not in the response cache (replay mode)")
+            return entry
+
+        ttl = board.get('cache_ttl', self.config.get('settings', {}).get('cache_ttl', 0))
+        if ttl:
+            return self.cache.get(url, max_age=ttl)
+        return None
+
+    def record_response(self, url: str, status: int, headers, body: bytes):
+        """Store a fetched response in the response cache"""
+        if self.cache is None:
+            return
+        if status == 304:
+            self.cache.touch(url)
+        else:
+            self.cache.put(url, status, headers, body)
+
+    def fetch(self, board: Dict, url: str, headers: Optional[Dict] = None) -> requests.Response:
+        """GET a URL for a board, sending validators from the previous run
+
+        Fresh entries in the response cache are served without touching the network.
+        """
+        entry = self.cached_response(board, url)
+        if entry is not None:
+            response = requests.Response()
+            response.url = url
+            response.status_code = entry['status']
+            response.headers.update(entry['headers'])
+            response._content = entry['body']
+            return response
+
+        headers = dict(headers or {})
+        headers.update(self.conditional_headers(board, url))
+        response = self.session.get(url, headers=headers, timeout=15)
+        self.record_response(url, response.status_code, response.headers, response.content)
+        return response
+
+    def parser_backend(self, board: Dict, default: str = 'html.parser') -> str:
+        """HTML parser backend for a board: board 'parser', then settings.parser, then default"""
+        return board.get('parser') or self.config.get('settings', {}).get('parser') or default
 
     def scrape_generic(self, board: Dict) -> List[Dict]:
         """Scrape generic job boards using custom selectors"""
         jobs = []
         try:
-            response = requests.get(board['url'], headers=self.headers, timeout=15)
+            response = self.fetch(board, board['url'])
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            selectors = board.get('selectors', {})
-            job_containers = soup.select(selectors.get('job_container', 'div'))
-
-            for container in job_containers:
-                try:
-                    # Check if container itself is a link (for simple job boards)
-                    if container.name == 'a' and container.get('href'):
-                        title = container.text.strip()
-                        link = urljoin(board['url'], container['href'])
-                        location = ''
-                        description = ''
-                        date_posted = ''
-                    else:
-                        title_elem = container.select_one(selectors.get('title', 'h2'))
-                        title = title_elem.text.strip() if title_elem else 'No title'
-
-                        location_elem = container.select_one(selectors.get('location', ''))
-                        location = location_elem.text.strip() if location_elem else ''
-
-                        description_elem = container.select_one(selectors.get('description', ''))
-                        description = description_elem.text.strip() if description_elem else ''
-
-                        link_elem = container.select_one(selectors.get('link', 'a'))
-                        link = ''
-                        if link_elem and link_elem.get('href'):
-                            link = urljoin(board['url'], link_elem['href'])
-
-                        date_elem = container.select_one(selectors.get('date_posted', ''))
-                        date_posted = date_elem.text.strip() if date_elem else ''
-
-                    job = {
-                        'title': title,
-                        'company': board.get('name', 'Unknown'),
-                        'location': location,
-                        'description': description[:500],
-                        'url': link,
-                        'date_posted': date_posted,
-                        'source': board['name'],
-                        'scraped_at': datetime.now().isoformat()
-                    }
-                    job['id'] = self.generate_job_id(job)
-                    jobs.append(job)
-
-                except Exception as e:
-                    print(f"Error parsing job container: {e}")
-                    continue
+            if response.status_code == 304:
+                return self.reuse_jobs(board)
+            jobs = self.parse_once(board, board['url'], response.headers, response.content,
+                                   lambda: self.parse_generic(board, response.content))
 
         except requests.RequestException as e:
-            print(f"Error scraping {board['name']}: {e}")
+            self.scrape_failed(board, f"Error scraping {board['name']}: {e}")
+
+        return jobs
+
+    def generic_selectors(self, board: Dict) -> Dict[str, Optional[CompiledSelector]]:
+        """Compiled selectors of a generic board (None for the ones it leaves empty)"""
+        selectors = board.get('selectors', {})
+        return compile_selectors({
+            'job_container': selectors.get('job_container', 'div'),
+            'title': selectors.get('title', 'h2'),
+            'location': selectors.get('location', ''),
+            'description': selectors.get('description', ''),
+            'link': selectors.get('link', 'a'),
+            'date_posted': selectors.get('date_posted', ''),
+        })
+
+    def parse_generic(self, board: Dict, content: bytes) -> List[Dict]:
+        """Parse a generic job board page using custom selectors"""
+        jobs = []
+        try:
+            selectors = self.generic_selectors(board)
+        except Exception as e:
+            print(f"Invalid selector for {board['name']}: {e}")
+            return jobs
+        if selectors['job_container'] is None:
+            print(f"No job_container selector for {board['name']}")
+            return jobs
+
+        # Scoped parsing builds only the subtrees that can hold job containers
+        strainer = None
+        if board.get('scoped_parse', self.config.get('settings', {}).get('scoped_parse', False)):
+            strainer = selectors['job_container'].strainer
+        soup = parse_html(content, self.parser_backend(board), strainer)
+        job_containers = selectors['job_container'].select(soup)
+
+        def select_text(container, name: str, default: str = '') -> str:
+            """Stripped text of the element matching a selector (default if unset or not found)"""
+            elem = selectors[name].select_one(container) if selectors[name] else None
+            return elem.text.strip() if elem else default
+
+        for container in job_containers:
+            try:
+                # Check if container itself is a link (for simple job boards)
+                if container.name == 'a' and container.get('href'):
+                    title = container.text.strip()
+                    link = urljoin(board['url'], container.get('href'))
+                    location = ''
+                    description = ''
+                    date_posted = ''
+                else:
+                    title = select_text(container, 'title', 'No title')
+                    location = select_text(container, 'location')
+                    description = select_text(container, 'description')
+
+                    link_elem = selectors['link'].select_one(container) if selectors['link'] else None
+                    link = ''
+                    if link_elem and link_elem.get('href'):
+                        link = urljoin(board['url'], link_elem.get('href'))
+
+                    date_posted = select_text(container, 'date_posted')
+
+                job = {
+                    'title': title,
+                    'company': board.get('name', 'Unknown'),
+                    'location': location,
+                    'description': description[:self.description_limit],
+                    'url': link,
+                    'date_posted': date_posted,
+                    'source': board['name'],
+                    'scraped_at': datetime.now().isoformat()
+                }
+                job['id'] = self.generate_job_id(job)
+                jobs.append(job)
+
+            except Exception as e:
+                print(f"Error parsing job container: {e}")
+                continue
 
         return jobs
 
     def scrape_greenhouse(self, board: Dict) -> List[Dict]:
         """Scrape Greenhouse job boards"""
+        if self.choose_endpoint(board) == 'html':
+            return self.scrape_greenhouse_html(board)
+
         jobs = []
         try:
             # Greenhouse boards often have JSON endpoints
             api_url = board['url'].rstrip('/') + '/embed/jobs.json'
-            response = requests.get(api_url, headers=self.headers, timeout=15)
-
-            if response.status_code == 200:
-                data = response.json()
-                for job_data in data.get('jobs', []):
-                    job = {
-                        'title': job_data.get('title', 'No title'),
-                        'company': board.get('name', 'Unknown'),
-                        'location': job_data.get('location', {}).get('name', ''),
-                        'description': '',
-                        'url': job_data.get('absolute_url', ''),
-                        'date_posted': job_data.get('updated_at', ''),
-                        'source': board['name'],
-                        'scraped_at': datetime.now().isoformat()
-                    }
-                    job['id'] = self.generate_job_id(job)
-                    jobs.append(job)
+            response = self.fetch(board, api_url)
+
+            if response.status_code == 304:
+                jobs = self.reuse_jobs(board)
+            elif response.status_code == 200:
+                jobs = self.parse_once(board, api_url, response.headers, response.content,
+                                       lambda: self.parse_greenhouse(board, response.json()))
+                self.remember_endpoint(board, 'json')
             else:
-                # Fallback to HTML scraping
+                # Fallback to HTML scraping (for this run only unless the endpoint is missing)
+                if response.status_code in MISSING_ENDPOINT_STATUSES:
+                    self.remember_endpoint(board, 'html')
                 jobs = self.scrape_greenhouse_html(board)
 
         except Exception as e:
             print(f"Error scraping Greenhouse board {board['name']}: {e}")
+            # Invalid JSON means the endpoint is not there; network errors may be transient
+            if isinstance(e, ValueError):
+                self.remember_endpoint(board, 'html')
             # Try HTML fallback
             jobs = self.scrape_greenhouse_html(board)
 
         return jobs
 
+    def parse_greenhouse(self, board: Dict, data: Dict) -> List[Dict]:
+        """Parse the Greenhouse embed/jobs.json payload"""
+        jobs = []
+        for job_data in data.get('jobs', []):
+            job = {
+                'title': job_data.get('title', 'No title'),
+                'company': board.get('name', 'Unknown'),
+                'location': job_data.get('location', {}).get('name', ''),
+                'description': '',
+                'url': job_data.get('absolute_url', ''),
+                'date_posted': job_data.get('updated_at', ''),
+                'source': board['name'],
+                'scraped_at': datetime.now().isoformat(),
+                'native_id': native_id('greenhouse', job_data.get('id'), job_data.get('absolute_url', ''))
+            }
+            job['id'] = self.generate_job_id(job)
+            jobs.append(job)
+        return jobs
+
     def scrape_greenhouse_html(self, board: Dict) -> List[Dict]:
         """Scrape Greenhouse boards via HTML"""
         jobs = []
         try:
-            response = requests.get(board['url'], headers=self.headers, timeout=15)
+            response = self.fetch(board, board['url'])
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            job_sections = soup.select('section.level-0')
-            for section in job_sections:
-                job_links = section.select('div.opening a')
-                for link in job_links:
-                    job = {
-                        'title': link.text.strip(),
-                        'company': board.get('name', 'Unknown'),
-                        'location': '',
-                        'description': '',
-                        'url': urljoin(board['url'], link.get('href', '')),
-                        'date_posted': '',
-                        'source': board['name'],
-                        'scraped_at': datetime.now().isoformat()
-                    }
-                    job['id'] = self.generate_job_id(job)
-                    jobs.append(job)
+            if response.status_code == 304:
+                return self.reuse_jobs(board)
+            jobs = self.parse_once(board, board['url'], response.headers, response.content,
+                                   lambda: self.parse_greenhouse_html(board, response.content))
 
         except Exception as e:
-            print(f"Error scraping Greenhouse HTML for {board['name']}: {e}")
+            self.scrape_failed(board, f"Error scraping Greenhouse HTML for {board['name']}: {e}")
 
         return jobs
 
+    def parse_greenhouse_html(self, board: Dict, content: bytes) -> List[Dict]:
+        """Parse a Greenhouse board HTML page"""
+        jobs = []
+        soup = parse_html(content, self.parser_backend(board))
+
+        job_sections = soup.select('section.level-0')
+        for section in job_sections:
+            job_links = section.select('div.opening a')
+            for link in job_links:
+                job = {
+                    'title': link.text.strip(),
+                    'company': board.get('name', 'Unknown'),
+                    'location': '',
+                    'description': '',
+                    'url': urljoin(board['url'], link.get('href', '')),
+                    'date_posted': '',
+                    'source': board['name'],
+                    'scraped_at': datetime.now().isoformat()
+                }
+                job['native_id'] = native_id('greenhouse', url=job['url'])
+                job['id'] = self.generate_job_id(job)
+                jobs.append(job)
+        return jobs
+
     def scrape_lever(self, board: Dict) -> List[Dict]:
         """Scrape Lever job boards with JSON API and HTML fallback"""
         jobs = []
         try:
-            # Try Lever JSON API first
-            api_url = board['url'].rstrip('/') + '?mode=json'
-            response = requests.get(api_url, headers=self.headers, timeout=15)
-
-            if response.status_code == 200:
-                # Check if response is actually JSON
-                try:
-                    job_listings = response.json()
-                    # Parse JSON response
-                    for job_data in job_listings:
-                        job = {
-                            'title': job_data.get('text', 'No title'),
-                            'company': board.get('name', 'Unknown'),
-                            'location': job_data.get('categories', {}).get('location', ''),
-                            'description': job_data.get('description', '')[:500],
-                            'url': job_data.get('hostedUrl', ''),
-                            'date_posted': str(job_data.get('createdAt', '')),
-                            'source': board['name'],
-                            'scraped_at': datetime.now().isoformat()
-                        }
-                        job['id'] = self.generate_job_id(job)
-                        jobs.append(job)
-                    return jobs
-                except ValueError:
-                    # JSON parsing failed, response is HTML - fall back to HTML parsing
-                    print(f"  Lever JSON API not available for {board['name']}, using HTML fallback")
-                    pass
+            # Try Lever JSON API first, unless it failed for this board before
+            if self.choose_endpoint(board) == 'json':
+                api_url = board['url'].rstrip('/') + '?mode=json'
+                response = self.fetch(board, api_url)
+
+                if response.status_code == 304:
+                    return self.reuse_jobs(board)
+                if response.status_code == 200:
+                    # Check if response is actually JSON
+                    try:
+                        jobs = self.parse_once(board, api_url, response.headers, response.content,
+                                               lambda: self.parse_lever(board, response.json()))
+                        self.remember_endpoint(board, 'json')
+                        return jobs
+                    except ValueError:
+                        # JSON parsing failed, response is HTML - fall back to HTML parsing
+                        print(f"  Lever JSON API not available for {board['name']}, using HTML fallback")
+                        self.remember_endpoint(board, 'html')
+                elif response.status_code in MISSING_ENDPOINT_STATUSES:
+                    self.remember_endpoint(board, 'html')
 
             # HTML fallback: parse the page directly
             html_url = board['url'].rstrip('/')
-            response = requests.get(html_url, headers=self.headers, timeout=15)
-
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'lxml')
-                postings = soup.find_all('div', class_='posting')
-
-                for posting in postings:
-                    # Extract title
-                    title_elem = posting.find('h5')
-                    title = title_elem.get_text(strip=True) if title_elem else 'No title'
-
-                    # Extract link
-                    link_elem = posting.find('a', href=True)
-                    url = link_elem.get('href', '') if link_elem else ''
-
-                    # Extract location
-                    location_elem = posting.find(class_='location')
-                    location = location_elem.get_text(strip=True) if location_elem else ''
-
-                    # Extract team/department if available
-                    department_elem = posting.find(class_='department')
-                    department = department_elem.get_text(strip=True) if department_elem else ''
-
-                    job = {
-                        'title': title,
-                        'company': board.get('name', 'Unknown'),
-                        'location': location,
-                        'department': department,
-                        'description': '',  # HTML version doesn't have description on listing page
-                        'url': url,
-                        'date_posted': '',  # HTML version doesn't have date on listing page
-                        'source': board['name'],
-                        'scraped_at': datetime.now().isoformat()
-                    }
-                    job['id'] = self.generate_job_id(job)
-                    jobs.append(job)
+            response = self.fetch(board, html_url)
+            response.raise_for_status()
+
+            if response.status_code == 304:
+                jobs = self.reuse_jobs(board)
+            elif response.status_code == 200:
+                jobs = self.parse_once(board, html_url, response.headers, response.content,
+                                       lambda: self.parse_lever_html(board, response.text))
 
         except Exception as e:
-            print(f"Error scraping Lever board {board['name']}: {e}")
+            self.scrape_failed(board, f"Error scraping Lever board {board['name']}: {e}")
 
         return jobs
 
+    def parse_lever(self, board: Dict, job_listings: List[Dict]) -> List[Dict]:
+        """Parse the Lever ?mode=json payload"""
+        jobs = []
+        for job_data in job_listings:
+            job = {
+                'title': job_data.get('text', 'No title'),
+                'company': board.get('name', 'Unknown'),
+                'location': job_data.get('categories', {}).get('location', ''),
+                'description': job_data.get('description', '')[:self.description_limit],
+                'url': job_data.get('hostedUrl', ''),
+                'date_posted': str(job_data.get('createdAt', '')),
+                'source': board['name'],
+                'scraped_at': datetime.now().isoformat(),
+                'native_id': native_id('lever', job_data.get('id'), job_data.get('hostedUrl', ''))
+            }
+            job['id'] = self.generate_job_id(job)
+            jobs.append(job)
+        return jobs
+
+    def parse_lever_html(self, board: Dict, text: str) -> List[Dict]:
+        """Parse a Lever board HTML page"""
+        jobs = []
+        soup = BeautifulSoup(text, soup_backend(self.parser_backend(board, 'lxml')))
+        postings = soup.find_all('div', class_='posting')
+
+        for posting in postings:
+            # Extract title
+            title_elem = posting.find('h5')
+            title = title_elem.get_text(strip=True) if title_elem else 'No title'
+
+            # Extract link
+            link_elem = posting.find('a', href=True)
+            url = link_elem.get('href', '') if link_elem else ''
+
+            # Extract location
+            location_elem = posting.find(class_='location')
+            location = location_elem.get_text(strip=True) if location_elem else ''
+
+            # Extract team/department if available
+            department_elem = posting.find(class_='department')
+            department = department_elem.get_text(strip=True) if department_elem else ''
+
+            job = {
+                'title': title,
+                'company': board.get('name', 'Unknown'),
+                'location': location,
+                'department': department,
+                'description': '',  # HTML version doesn't have description on listing page
+                'url': url,
+                'date_posted': '',  # HTML version doesn't have date on listing page
+                'source': board['name'],
+                'scraped_at': datetime.now().isoformat(),
+                'native_id': native_id('lever', url=url)
+            }
+            job['id'] = self.generate_job_id(job)
+            jobs.append(job)
+        return jobs
+
+    def api_headers(self, board: Dict) -> Dict:
+        """Request headers for a custom API board"""
+        headers = self.headers.copy()
+        if 'headers' in board:
+            headers.update(board['headers'])
+        return headers
+
     def scrape_api(self, board: Dict) -> List[Dict]:
         """Scrape jobs from custom API endpoints"""
         jobs = []
         try:
-            headers = self.headers.copy()
-            if 'headers' in board:
-                headers.update(board['headers'])
+            if board.get('stream') and self.cache is None:
+                return self.stream_api(board)
 
-            response = requests.get(board['url'], headers=headers, timeout=15)
+            response = self.fetch(board, board['url'], headers=self.api_headers(board))
             response.raise_for_status()
-            data = response.json()
+            if response.status_code == 304:
+                return self.reuse_jobs(board)
+            jobs = self.parse_once(board, board['url'], response.headers, response.content,
+                                   lambda: self.parse_api(board, response.json()))
 
-            # Customize based on your API structure
-            job_list = data if isinstance(data, list) else data.get('jobs', [])
+        except Exception as e:
+            self.scrape_failed(board, f"Error scraping API {board['name']}: {e}")
 
-            for job_data in job_list:
-                job = {
-                    'title': job_data.get('title', 'No title'),
-                    'company': job_data.get('company', board.get('name', 'Unknown')),
-                    'location': job_data.get('location', ''),
-                    'description': job_data.get('description', '')[:500],
-                    'url': job_data.get('url', job_data.get('link', '')),
-                    'date_posted': job_data.get('posted_date', job_data.get('date', '')),
-                    'source': board['name'],
-                    'scraped_at': datetime.now().isoformat()
-                }
-                job['id'] = self.generate_job_id(job)
-                jobs.append(job)
+        return jobs
 
-        except Exception as e:
-            print(f"Error scraping API {board['name']}: {e}")
+    def stream_api(self, board: Dict) -> List[Dict]:
+        """Scrape a custom API board while it downloads (boards with "stream": true)
+
+        Jobs are decoded one at a time from the array at job_path, and when
+        the board sets next_cursor every following page is fetched the same
+        way, so memory stays flat however large the feed is. Like streamed
+        Next.js boards this skips the response cache and fingerprint check;
+        ETag/Last-Modified only apply to unpaginated feeds.
+        """
+        jobs = []
+        paginated = bool(board.get('next_cursor'))
+        max_pages = max(1, int(board.get('max_pages', 100)))
+        url, seen, validators = board['url'], set(), {}
+        while url and url not in seen and len(seen) < max_pages:
+            seen.add(url)
+            headers = self.api_headers(board)
+            if not paginated:
+                headers.update(self.conditional_headers(board, url))
+            stream = self.api_stream(board)
+            with self.session.get(url, headers=headers, timeout=15, stream=True) as response:
+                response.raise_for_status()
+                if response.status_code == 304:
+                    return self.reuse_jobs(board)
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    jobs.extend(self.api_jobs(board, stream.feed(chunk)))
+                    if stream.done:
+                        break
+                jobs.extend(self.api_jobs(board, stream.close()))
+            if not paginated:
+                validators = response.headers
+            url = self.next_page_url(board, url, stream.captured)
+
+        self.remember_jobs(board, board['url'], validators, jobs)
+        return jobs
 
+    def api_stream(self, board: Dict) -> EmbeddedJsonStream:
+        """Incremental parser for one page of a custom API board"""
+        if 'job_path' in board:
+            paths = [json_path(board['job_path'])]
+        else:
+            # A top-level list or a "jobs" key, as parse_api accepts
+            paths = [(), ('jobs',)]
+        capture = [json_path(board['next_cursor'])] if board.get('next_cursor') else []
+        return EmbeddedJsonStream(paths, capture=capture)
+
+    def next_page_url(self, board: Dict, url: str, captured: Dict) -> Optional[str]:
+        """URL of the page after url, from the cursor found at the board's next_cursor path
+
+        With cursor_param the cursor is sent as that query parameter of the
+        board URL; otherwise it is a (possibly relative) URL of the next page.
+        """
+        if not board.get('next_cursor'):
+            return None
+        cursor = captured.get(json_path(board['next_cursor']))
+        if cursor is None or cursor == '' or cursor is False:
+            return None
+        if board.get('cursor_param'):
+            parts = urlparse(board['url'])
+            query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                     if key != board['cursor_param']]
+            query.append((board['cursor_param'], str(cursor)))
+            return urlunparse(parts._replace(query=urlencode(query)))
+        return urljoin(url, str(cursor))
+
+    def parse_api(self, board: Dict, data) -> List[Dict]:
+        """Parse a custom API payload"""
+        if 'job_path' in board:
+            job_list = lookup(data, json_path(board['job_path'])) or []
+        else:
+            # Customize based on your API structure
+            job_list = data if isinstance(data, list) else data.get('jobs', [])
+        return self.api_jobs(board, job_list)
+
+    def api_jobs(self, board: Dict, job_list: List[Dict]) -> List[Dict]:
+        """Jobs from entries of a custom API job list, applying the board's field mapping
+
+        A board's "fields" maps job fields to (dotted) keys of the entries,
+        e.g. {"title": "name", "location": "office.city"}.
+        """
+        fields = board.get('fields', {})
+
+        def field(job_data: Dict, name: str, default: str, *keys: str):
+            """Value of a job field: the mapped key if configured, else the first of keys present"""
+            if name in fields:
+                value = lookup(job_data, json_path(fields[name]))
+                return default if value is None else str(value)
+            for key in keys:
+                if key in job_data:
+                    return job_data[key]
+            return default
+
+        jobs = []
+        for job_data in job_list:
+            job = {
+                'title': field(job_data, 'title', 'No title', 'title'),
+                'company': field(job_data, 'company', board.get('name', 'Unknown'), 'company'),
+                'location': field(job_data, 'location', '', 'location'),
+                'description': field(job_data, 'description', '', 'description')[:self.description_limit],
+                'url': field(job_data, 'url', '', 'url', 'link'),
+                'date_posted': field(job_data, 'date_posted', '', 'posted_date', 'date'),
+                'source': board['name'],
+                'scraped_at': datetime.now().isoformat()
+            }
+            if 'native_id' in fields:
+                job['native_id'] = native_id('api', field(job_data, 'native_id', ''))
+            job['id'] = self.generate_job_id(job)
+            jobs.append(job)
         return jobs
 
     def scrape_nextjs(self, board: Dict) -> List[Dict]:
         """Scrape Next.js job boards with embedded __NEXT_DATA__"""
         jobs = []
         try:
-            response = requests.get(board['url'], headers=self.headers, timeout=15)
-            response.raise_for_status()
+            if board.get('stream') and self.cache is None:
+                return self.stream_nextjs(board)
 
-            # Find __NEXT_DATA__ script tag
-            match = re.search(r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>',
-                            response.text, re.DOTALL)
-
-            if match:
-                data = json.loads(match.group(1))
-
-                # Extract job list from pageProps
-                job_list = []
-                if 'props' in data and 'pageProps' in data['props']:
-                    page_props = data['props']['pageProps']
-                    job_list = page_props.get('list', page_props.get('jobs', []))
-
-                for job_data in job_list:
-                    # Skip dummy or inactive jobs
-                    if job_data.get('jobTitle', '').lower() == 'dummy job':
-                        continue
-                    if not job_data.get('visible', True):
-                        continue
-                    if job_data.get('status') != 'active':
-                        continue
-
-                    # Extract location
-                    locations = job_data.get('officeLocations', [])
-                    location = locations[0].get('title', '') if locations else ''
-
-                    job = {
-                        'title': job_data.get('jobTitle', 'No title'),
-                        'company': board.get('name', 'Unknown'),
-                        'location': location,
-                        'description': job_data.get('description', '')[:500],
-                        'url': urljoin(board['url'], f"/positions/{job_data.get('id', '')}"),
-                        'date_posted': '',
-                        'source': board['name'],
-                        'scraped_at': datetime.now().isoformat()
-                    }
-                    job['id'] = self.generate_job_id(job)
-                    jobs.append(job)
-            else:
-                print(f"Could not find Next.js data in {board['name']}")
+            response = self.fetch(board, board['url'])
+            response.raise_for_status()
+            if response.status_code == 304:
+                return self.reuse_jobs(board)
+            next_data = self.extract_next_data(response.text)
+            jobs = self.parse_once(board, board['url'], response.headers,
+                                   (next_data or '').encode(),
+                                   lambda: self.parse_next_data(board, next_data))
 
         except Exception as e:
-            print(f"Error scraping Next.js board {board['name']}: {e}")
+            self.scrape_failed(board, f"Error scraping Next.js board {board['name']}: {e}")
+
+        return jobs
+
+    def stream_nextjs(self, board: Dict) -> List[Dict]:
+        """Scrape a Next.js board while it downloads (boards with "stream": true)
+
+        Only the job list inside __NEXT_DATA__ is decoded, one job at a time,
+        and the download stops as soon as the list is complete. The page is
+        never held in memory, so the response cache and the payload
+        fingerprint check don't apply; ETag/Last-Modified still do.
+        """
+        jobs = []
+        stream = EmbeddedJsonStream(NEXT_DATA_JOB_PATHS, NEXT_DATA_SCRIPT)
+        headers = self.conditional_headers(board, board['url'])
+        with self.session.get(board['url'], headers=headers, timeout=15, stream=True) as response:
+            response.raise_for_status()
+            if response.status_code == 304:
+                return self.reuse_jobs(board)
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                jobs.extend(self.nextjs_jobs(board, stream.feed(chunk)))
+                if stream.done:
+                    break
+            jobs.extend(self.nextjs_jobs(board, stream.close()))
+
+        if not stream.started:
+            print(f"Could not find Next.js data in {board['name']}")
+        self.remember_jobs(board, board['url'], response.headers, jobs)
+        return jobs
+
+    def extract_next_data(self, text: str) -> Optional[str]:
+        """The raw __NEXT_DATA__ JSON embedded in a Next.js page, if any"""
+        match = re.search(r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>',
+                          text, re.DOTALL)
+        return match.group(1) if match else None
+
+    def parse_next_data(self, board: Dict, next_data: Optional[str]) -> List[Dict]:
+        """Parse a raw __NEXT_DATA__ JSON string (None if the page had none)"""
+        jobs = []
+
+        if next_data:
+            data = json.loads(next_data)
+
+            # Extract job list from pageProps
+            job_list = []
+            if 'props' in data and 'pageProps' in data['props']:
+                page_props = data['props']['pageProps']
+                job_list = page_props.get('list', page_props.get('jobs', []))
+
+            jobs = self.nextjs_jobs(board, job_list)
+        else:
+            print(f"Could not find Next.js data in {board['name']}")
 
         return jobs
 
+    def nextjs_jobs(self, board: Dict, job_list: List[Dict]) -> List[Dict]:
+        """Jobs from entries of a Next.js pageProps job list"""
+        jobs = []
+        for job_data in job_list:
+            # Skip dummy or inactive jobs
+            if job_data.get('jobTitle', '').lower() == 'dummy job':
+                continue
+            if not job_data.get('visible', True):
+                continue
+            if job_data.get('status') != 'active':
+                continue
+
+            # Extract location
+            locations = job_data.get('officeLocations', [])
+            location = locations[0].get('title', '') if locations else ''
+
+            job = {
+                'title': job_data.get('jobTitle', 'No title'),
+                'company': board.get('name', 'Unknown'),
+                'location': location,
+                'description': job_data.get('description', '')[:self.description_limit],
+                'url': urljoin(board['url'], f"/positions/{job_data.get('id', '')}"),
+                'date_posted': '',
+                'source': board['name'],
+                'scraped_at': datetime.now().isoformat(),
+                'native_id': native_id('nextjs', job_data.get('id'))
+            }
+            job['id'] = self.generate_job_id(job)
+            jobs.append(job)
+        return jobs
+
     def scrape_ashby(self, board: Dict) -> List[Dict]:
         """Scrape Ashby job boards"""
         jobs = []
         try:
-            response = requests.get(board['url'], headers=self.headers, timeout=15)
+            response = self.fetch(board, board['url'])
             response.raise_for_status()
+            if response.status_code == 304:
+                return self.reuse_jobs(board)
+            jobs = self.parse_once(board, board['url'], response.headers, response.content,
+                                   lambda: self.parse_ashby(board, response.content))
 
-            # Parse HTML to extract embedded JSON data
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Find script tag with window.__appData
-            script_tags = soup.find_all('script')
-            job_data = None
-
-            for script in script_tags:
-                if script.string and 'window.__appData' in script.string:
-                    # Extract JSON from window.__appData using regex
-                    script_content = script.string
-                    match = re.search(r'window\.__appData\s*=\s*(\{.*?\});', script_content, re.DOTALL)
-                    if match:
-                        json_str = match.group(1)
-                        job_data = json.loads(json_str)
-                        break
+        except Exception as e:
+            self.scrape_failed(board, f"Error scraping Ashby board {board['name']}: {e}")
 
-            # Check multiple possible structures for job postings
-            job_postings = []
-            if job_data:
-                if 'jobPostings' in job_data:
-                    job_postings = job_data['jobPostings']
-                elif 'jobBoard' in job_data and isinstance(job_data['jobBoard'], dict):
-                    # Check nested structure
-                    job_board = job_data['jobBoard']
-                    if 'jobPostings' in job_board:
-                        job_postings = job_board['jobPostings']
-                    elif 'jobs' in job_board:
-                        job_postings = job_board['jobs']
-
-            if job_postings:
-                for job_posting in job_postings:
-                    if not job_posting.get('isListed', True):
-                        continue
-
-                    job = {
-                        'title': job_posting.get('title', 'No title'),
-                        'company': board.get('name', 'Unknown'),
-                        'location': job_posting.get('locationName', ''),
-                        'description': job_posting.get('descriptionPlain', '')[:500],
-                        'url': urljoin(board['url'], f"/{job_posting.get('id', '')}"),
-                        'date_posted': job_posting.get('publishedDate', ''),
-                        'source': board['name'],
-                        'employment_type': job_posting.get('employmentType', ''),
-                        'department': job_posting.get('departmentName', ''),
-                        'scraped_at': datetime.now().isoformat()
-                    }
-                    job['id'] = self.generate_job_id(job)
-                    jobs.append(job)
-            else:
-                print(f"Could not find job data in Ashby board {board['name']}")
+        return jobs
 
-        except Exception as e:
-            print(f"Error scraping Ashby board {board['name']}: {e}")
+    def extract_app_data(self, content: bytes) -> Optional[Dict]:
+        """The window.__appData object embedded in an Ashby page, if any
+
+        Scans the raw bytes for the assignment instead of building a DOM, then
+        lets the JSON decoder consume exactly the balanced {...} that follows.
+        """
+        for match in APP_DATA_ASSIGNMENT.finditer(content):
+            if content[match.end():match.end() + 1] == b'{':
+                text = content[match.end():].decode('utf-8', errors='replace')
+                data, _ = json.JSONDecoder().raw_decode(text)
+                return data
+        return None
+
+    def parse_ashby(self, board: Dict, content: bytes) -> List[Dict]:
+        """Parse the window.__appData blob embedded in an Ashby page"""
+        jobs = []
+        job_data = self.extract_app_data(content)
+
+        # Check multiple possible structures for job postings
+        job_postings = []
+        if job_data:
+            if 'jobPostings' in job_data:
+                job_postings = job_data['jobPostings']
+            elif 'jobBoard' in job_data and isinstance(job_data['jobBoard'], dict):
+                # Check nested structure
+                job_board = job_data['jobBoard']
+                if 'jobPostings' in job_board:
+                    job_postings = job_board['jobPostings']
+                elif 'jobs' in job_board:
+                    job_postings = job_board['jobs']
+
+        if job_postings:
+            for job_posting in job_postings:
+                if not job_posting.get('isListed', True):
+                    continue
+
+                job = {
+                    'title': job_posting.get('title', 'No title'),
+                    'company': board.get('name', 'Unknown'),
+                    'location': job_posting.get('locationName', ''),
+                    'description': job_posting.get('descriptionPlain', '')[:self.description_limit],
+                    'url': urljoin(board['url'], f"/{job_posting.get('id', '')}"),
+                    'date_posted': job_posting.get('publishedDate', ''),
+                    'source': board['name'],
+                    'employment_type': job_posting.get('employmentType', ''),
+                    'department': job_posting.get('departmentName', ''),
+                    'scraped_at': datetime.now().isoformat(),
+                    'native_id': native_id('ashby', job_posting.get('id'))
+                }
+                job['id'] = self.generate_job_id(job)
+                jobs.append(job)
+        else:
+            print(f"Could not find job data in Ashby board {board['name']}")
 
         return jobs
 
@@ -410,61 +863,124 @@ class JobScraper:
         scraper_func = scraper_map.get(board_type, self.scrape_generic)
         return scraper_func(board)
 
-    def load_existing_jobs(self, filepath: str) -> List[Dict]:
-        """Load existing jobs from file"""
-        if os.path.exists(filepath):
-            try:
-                with open(filepath, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                return []
-        return []
-
-    def dedupe_jobs(self, new_jobs: List[Dict], existing_jobs: List[Dict]) -> List[Dict]:
-        """Remove duplicate jobs based on job ID"""
-        existing_ids = {job['id'] for job in existing_jobs}
-        return [job for job in new_jobs if job['id'] not in existing_ids]
-
-    def clean_old_jobs(self, jobs: List[Dict], max_age_days: int) -> List[Dict]:
-        """Remove jobs older than max_age_days"""
-        cutoff_date = datetime.now() - timedelta(days=max_age_days)
-
-        cleaned_jobs = []
-        for job in jobs:
+    def scrape_boards(self, boards: List[Dict]) -> List[List[Dict]]:
+        """Scrape several boards concurrently, returning results in board order
+
+        At most settings.max_workers boards are scraped at once, and at most
+        settings.max_per_host of them share a hostname. With settings.engine
+        set to "async" the boards are fetched on one event loop instead.
+        """
+        settings = self.config.get('settings', {})
+        if settings.get('engine', 'threads') == 'async':
             try:
-                scraped_at = datetime.fromisoformat(job.get('scraped_at', ''))
-                if scraped_at > cutoff_date:
-                    cleaned_jobs.append(job)
-            except (ValueError, TypeError):
-                # Keep job if we can't parse date
-                cleaned_jobs.append(job)
-
-        return cleaned_jobs
-
-    def save_jobs(self, jobs: List[Dict], filepath: str):
-        """Save jobs to JSON file"""
-        with open(filepath, 'w') as f:
-            json.dump(jobs, f, indent=2)
-        print(f"Saved {len(jobs)} jobs to {filepath}")
-
-    def export_to_csv(self, jobs: List[Dict], csv_path: str):
-        """Export jobs to CSV format"""
+                from async_engine import AsyncEngine
+                return AsyncEngine(self).run(boards)
+            except ImportError:
+                print("Warning: the async engine needs aiohttp (pip3 install aiohttp), using threads")
+
+        max_workers = max(1, int(settings.get('max_workers', 8)))
+        max_per_host = max(1, int(settings.get('max_per_host', 2)))
+
+        results = [[] for _ in boards]
+        if max_workers == 1 or len(boards) <= 1:
+            for i, board in enumerate(boards):
+                results[i] = self._scrape_board_safely(board)
+            return results
+
+        # Queue boards per host so a busy host never blocks the others
+        queued = defaultdict(deque)
+        for i, board in enumerate(boards):
+            queued[urlparse(board.get('url', '')).hostname or ''].append(i)
+        active = defaultdict(int)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while queued or running:
+                for host in list(queued):
+                    while (queued[host] and active[host] < max_per_host
+                           and len(running) < max_workers):
+                        i = queued[host].popleft()
+                        future = executor.submit(self._scrape_board_safely, boards[i])
+                        running[future] = (i, host)
+                        active[host] += 1
+                    if not queued[host]:
+                        del queued[host]
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i, host = running.pop(future)
+                    active[host] -= 1
+                    results[i] = future.result()
+
+        return results
+
+    def scrape_failed(self, board: Dict, message: str):
+        """Report that a board couldn't be scraped (its schedule is left alone this run)"""
+        print(message)
+        self.failed_boards.add(board.get('url'))
+
+    def _scrape_board_safely(self, board: Dict) -> List[Dict]:
+        """Scrape a board, never letting one failure abort the whole run"""
         try:
-            with open(csv_path, 'w') as f:
-                f.write("Company,Title,Location,Department,Type,URL,Date Posted,Scraped At\n")
-                for job in jobs:
-                    company = job['source'].replace(',', ' ')
-                    title = job['title'].replace(',', ' ')
-                    location = job.get('location', '').replace(',', ' ')
-                    department = job.get('department', '').replace(',', ' ')
-                    emp_type = job.get('employment_type', '').replace(',', ' ')
-                    url = job['url']
-                    date_posted = job.get('date_posted', '')
-                    scraped_at = job.get('scraped_at', '')
-                    f.write(f"{company},{title},{location},{department},{emp_type},{url},{date_posted},{scraped_at}\n")
-            print(f"Exported to CSV: {csv_path}")
+            return self.scrape_board(board)
         except Exception as e:
-            print(f"Warning: Could not export CSV: {e}")
+            self.scrape_failed(board, f"Error scraping {board.get('name', 'Unknown')}: {e}")
+            return []
+
+    def connection_stats(self) -> Dict:
+        """HTTP requests sent and connections opened/reused during this run"""
+        stats = self.session.connection_stats()
+        for key, value in self.async_connection_stats.items():
+            stats[key] = stats.get(key, 0) + value
+        return stats
+
+    def schedule_limits(self) -> tuple:
+        """(min, max) polling interval in seconds for the adaptive schedule"""
+        settings = self.config.get('settings', {})
+        min_interval = float(settings.get('min_interval_hours', 6)) * 3600
+        max_interval = float(settings.get('max_interval_hours', 168)) * 3600
+        return min_interval, max(min_interval, max_interval)
+
+    def is_due(self, board: Dict, now: datetime) -> bool:
+        """Whether the adaptive schedule wants this board scraped now
+
+        A board is due once 90% of its interval has passed, so a board on a
+        12 hour interval is still picked up by a run that starts a bit early.
+        """
+        schedule = self.state.get(board['url']).get('schedule')
+        if not schedule:
+            return True
+        last_scraped = datetime.fromisoformat(schedule['last_scraped'])
+        return now >= last_scraped + timedelta(seconds=0.9 * schedule['interval'])
+
+    def update_schedule(self, board: Dict, jobs: List[Dict], now: datetime):
+        """Record whether a board's job set changed and pick its next interval
+
+        Boards whose jobs changed are polled twice as often (down to
+        min_interval_hours), unchanged boards back off exponentially (up to
+        max_interval_hours).
+        """
+        min_interval, max_interval = self.schedule_limits()
+        fingerprint = job_set_fingerprint(jobs)
+        schedule = self.state.get(board['url']).get('schedule')
+
+        if not schedule:
+            schedule = {'interval': min_interval, 'last_changed': now.isoformat()}
+        elif schedule.get('job_set') != fingerprint:
+            schedule['interval'] = max(min_interval, schedule['interval'] / 2)
+            schedule['last_changed'] = now.isoformat()
+        else:
+            schedule['interval'] = min(max_interval, schedule['interval'] * 2)
+
+        schedule['job_set'] = fingerprint
+        schedule['last_scraped'] = now.isoformat()
+        schedule['next_due'] = (now + timedelta(seconds=schedule['interval'])).isoformat()
+        self.state.update(board['url'], schedule=schedule)
+
+    def dedupe_jobs(self, new_jobs: List[Dict], store) -> List[Dict]:
+        """Remove jobs whose ID is already in the job store"""
+        known_ids = store.known_ids(job['id'] for job in new_jobs)
+        return [job for job in new_jobs if job['id'] not in known_ids]
 
     def send_notification(self, title: str, message: str):
         """Send macOS notification"""
@@ -485,92 +1001,125 @@ class JobScraper:
             settings.get('output_file', 'jobs.json')
         )
 
-        # Load existing jobs
-        existing_jobs = self.load_existing_jobs(output_file)
-        print(f"Loaded {len(existing_jobs)} existing jobs")
+        # Open the job store (jobs.json or SQLite)
+        store = open_store(settings, os.path.dirname(os.path.abspath(__file__)))
+        print(f"Loaded {store.count()} existing jobs")
 
-        # Scrape all enabled job boards
-        all_new_jobs = []
+        # Scrape all enabled job boards (only those due when the schedule is adaptive)
+        adaptive = settings.get('adaptive_schedule', False) and not self.scrape_all
+        now = datetime.now()
+        enabled_boards = []
         for board in self.config.get('job_boards', []):
             if not board.get('enabled', False):
                 print(f"Skipping disabled board: {board.get('name', 'Unknown')}")
                 continue
+            if adaptive and not self.is_due(board, now):
+                next_due = self.state.get(board['url'])['schedule']['next_due']
+                print(f"Skipping {board.get('name', 'Unknown')}, not due until {next_due[:16]}")
+                continue
+            enabled_boards.append(board)
 
-            print(f"Scraping {board.get('name', 'Unknown')}...")
-            jobs = self.scrape_board(board)
+        print(f"Scraping {len(enabled_boards)} boards...")
+        all_new_jobs = []
+        for board, jobs in zip(enabled_boards, self.scrape_boards(enabled_boards)):
+            print(f"Scraped {board.get('name', 'Unknown')}")
             print(f"  Found {len(jobs)} jobs")
             all_new_jobs.extend(jobs)
+            # A failed scrape says nothing about the job set; the board is retried next run
+            if (settings.get('adaptive_schedule', False) and not self.replay
+                    and board['url'] not in self.failed_boards):
+                self.update_schedule(board, jobs, now)
 
         # Deduplicate if enabled
         if settings.get('dedupe', True):
-            unique_new_jobs = self.dedupe_jobs(all_new_jobs, existing_jobs)
+            unique_new_jobs = self.dedupe_jobs(all_new_jobs, store)
             print(f"Found {len(unique_new_jobs)} new unique jobs")
         else:
             unique_new_jobs = all_new_jobs
 
-        # Combine with existing jobs
-        all_jobs = existing_jobs + unique_new_jobs
+        # Fetch full descriptions for the new jobs only
+        if settings.get('enrich_descriptions', False):
+            DetailEnricher(self).enrich(unique_new_jobs)
+
+        if self.cache is not None and not self.replay:
+            self.cache.save()
+
+        # Keep only a reference to full descriptions in the job records
+        descriptions = open_descriptions(settings, os.path.dirname(os.path.abspath(__file__)))
+        if descriptions is not None:
+            descriptions.detach(unique_new_jobs)
+            # The board state keeps references too, so reused jobs don't carry the full text
+            descriptions.detach(self.state.all_jobs())
+        self.state.save()
+
+        # Add to the existing jobs
+        store.add(unique_new_jobs)
 
         # Clean old jobs if max_age_days is set
         max_age = settings.get('max_age_days')
         if max_age:
-            all_jobs = self.clean_old_jobs(all_jobs, max_age)
-            print(f"After cleaning old jobs: {len(all_jobs)} total jobs")
+            store.expire(max_age)
+            print(f"After cleaning old jobs: {store.count()} total jobs")
 
         # Save results
-        self.save_jobs(all_jobs, output_file)
-
-        # Auto-export to CSV
+        store.save()
+        total_jobs = store.count()
+        print(f"Saved {total_jobs} jobs to {store.location}")
+        all_jobs = None
+        if descriptions is not None:
+            all_jobs = store.all_jobs()
+            refs = [job.get('description_ref') for job in all_jobs]
+            refs += [job.get('description_ref') for job in self.state.all_jobs()]
+            dropped = descriptions.prune(refs)
+            if dropped:
+                print(f"Dropped {dropped} descriptions of removed jobs from {descriptions.path}")
+
+        # Export to CSV, a titles file and the optional columnar snapshot in one pass
+        # (skipped if the jobs didn't change)
         csv_path = output_file.replace('.json', '.csv')
-        self.export_to_csv(all_jobs, csv_path)
-
-        # Export to text file as well
         txt_path = output_file.replace('.json', '_titles.txt')
-        try:
-            with open(txt_path, 'w') as f:
-                f.write("=" * 70 + "\n")
-                f.write(f"JOB TITLES - {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
-                f.write("=" * 70 + "\n")
-                f.write(f"Total Jobs: {len(all_jobs)}\n")
-                f.write("=" * 70 + "\n\n")
-
-                from collections import defaultdict
-                by_company = defaultdict(list)
-                for job in all_jobs:
-                    by_company[job['source']].append(job)
-
-                for company in sorted(by_company.keys()):
-                    company_jobs = by_company[company]
-                    f.write(f"\n{company} ({len(company_jobs)} jobs)\n")
-                    f.write("-" * 70 + "\n")
-                    for i, job in enumerate(company_jobs, 1):
-                        location = f" | {job['location']}" if job['location'] else ""
-                        f.write(f"{i}. {job['title']}{location}\n")
-
-                f.write("\n" + "=" * 70 + "\n")
-            print(f"Exported to TXT: {txt_path}")
-        except Exception as e:
-            print(f"Warning: Could not export TXT: {e}")
+        sinks = [CsvSink(csv_path), TitlesSink(txt_path)]
+        if settings.get('columnar_snapshot', False):
+            snapshot = columnar_sink(os.path.splitext(output_file)[0])
+            if snapshot is not None:
+                sinks.append(snapshot)
+        export_jobs(sinks, store,
+                    os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 settings.get('export_state_file', 'export_state.json')),
+                    jobs=all_jobs)
+        store.close()
 
         # Send notification if new jobs found
         if len(unique_new_jobs) > 0:
             self.send_notification(
                 "Job Scraper",
-                f"Found {len(unique_new_jobs)} new job(s)! Total: {len(all_jobs)}"
+                f"Found {len(unique_new_jobs)} new job(s)! Total: {total_jobs}"
             )
 
         print(f"Scraping completed at {datetime.now()}")
         print(f"New jobs found: {len(unique_new_jobs)}")
-        print(f"Total jobs stored: {len(all_jobs)}")
+        print(f"Total jobs stored: {total_jobs}")
+        stats = self.connection_stats()
+        print(f"HTTP requests: {stats['requests']} over {stats['new_connections']} connections "
+              f"({stats['reused_connections']} reused)")
         print(f"\nFiles updated:")
-        print(f"  • {output_file}")
+        print(f"  • {store.location}")
         print(f"  • {csv_path}")
         print(f"  • {txt_path}")
+        for sink in sinks[2:]:
+            print(f"  • {sink.path}")
 
 
 def main():
     """Main entry point"""
-    scraper = JobScraper()
+    parser = argparse.ArgumentParser(description='Scrape the job boards in config.json')
+    parser.add_argument('--replay', action='store_true',
+                        help='serve every response from the response cache, without any network access')
+    parser.add_argument('--all', action='store_true', dest='scrape_all',
+                        help='scrape every enabled board, even those the adaptive schedule says are not due')
+    args = parser.parse_args()
+
+    scraper = JobScraper(replay=args.replay, scrape_all=args.scrape_all)
     scraper.run()
 
 
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Checks for json_stream: the streamed items and captured values must match
+json.loads of the whole document however the download is chunked.
+
+    python3 -m unittest test_json_stream
+"""
+
+import json
+import unittest
+
+from json_stream import JsonArrayStream
+
+
+DOCUMENT = json.dumps({
+    'x': -2500.0,
+    'meta': {'total': 1.5e-07, 'score': -0.25, 'flags': [True, False, None], 'page': 12},
+    'data': {
+        'jobs': [
+            {'id': 1, 'title': 'Engineer', 'salary': -12.5e3, 'tags': ['a', 'b']},
+            {'id': 22, 'title': 'Designer, "Senior"', 'salary': 0.001, 'remote': True},
+        ],
+        'next': 'cursor-2',
+        'count': 1234567890123,
+    },
+})
+
+
+def stream(document: str, chunk_size: int, paths, capture=()) -> tuple:
+    """Items and captured values of document fed in chunks of chunk_size characters"""
+    parser = JsonArrayStream(paths, capture)
+    items = []
+    for i in range(0, len(document), chunk_size):
+        items += parser.feed(document[i:i + chunk_size])
+    items += parser.close()
+    return items, parser.captured
+
+
+class ChunkBoundaryTest(unittest.TestCase):
+    """Values split at every possible position"""
+
+    def test_round_trip_one_character_at_a_time(self):
+        """Chunks of one character give the same items and captured values as json.loads"""
+        expected = json.loads(DOCUMENT)
+        paths, capture = [('data', 'jobs')], [('x',), ('meta', 'total'), ('data', 'count')]
+        for chunk_size in (1, 2, 3, 7, len(DOCUMENT)):
+            items, captured = stream(DOCUMENT, chunk_size, paths, capture)
+            self.assertEqual(items, expected['data']['jobs'])
+            self.assertEqual(captured, {('x',): -2500.0, ('meta', 'total'): 1.5e-07,
+                                        ('data', 'count'): 1234567890123})
+
+    def test_number_cut_after_decimal_point(self):
+        """A number cut right after '.' waits for the rest instead of failing"""
+        parser = JsonArrayStream([('jobs',)], [('x',)])
+        self.assertEqual(parser.feed('{"x": -2500.'), [])
+        self.assertEqual(parser.feed('0, "jobs": []}'), [])
+        self.assertEqual(parser.captured, {('x',): -2500.0})
+        self.assertTrue(parser.done)
+
+    def test_numeric_items_cut_by_chunks(self):
+        """Top-level numbers in the wanted array survive being cut anywhere"""
+        document = '{"jobs": [1.5, 2, -3e2, 40.25, 0], "next": 7}'
+        for chunk_size in (1, 2, 3, 5):
+            items, captured = stream(document, chunk_size, [('jobs',)], [('next',)])
+            self.assertEqual(items, [1.5, 2, -300.0, 40.25, 0])
+            self.assertEqual(captured, {('next',): 7})
+
+        parser = JsonArrayStream([('jobs',)])
+        self.assertEqual(parser.feed('{"jobs": [1.'), [])
+        self.assertEqual(parser.feed('5, 2]}'), [1.5, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
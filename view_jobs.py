@@ -3,17 +3,20 @@
 Simple job viewer - shows all jobs organized by company
 """
 
-import json
 from collections import defaultdict
 
+from job_store import configured_store
+
 
 def main():
+    store = configured_store()
     try:
-        with open('jobs.json', 'r') as f:
-            jobs = json.load(f)
-    except FileNotFoundError:
-        print("No jobs found. Run 'python3 scraper.py' first.")
-        return
+        if not store.exists():
+            print("No jobs found. Run 'python3 scraper.py' first.")
+            return
+        jobs = store.all_jobs()
+    finally:
+        store.close()
 
     if not jobs:
         print("No jobs in database.")
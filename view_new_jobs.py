@@ -3,35 +3,27 @@
 View new jobs from the most recent scrape
 """
 
-import json
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from job_store import configured_store
+
 
 def main():
-    # Load all jobs
+    store = configured_store()
     try:
-        with open('jobs.json', 'r') as f:
-            jobs = json.load(f)
-    except FileNotFoundError:
-        print("No jobs found. Run 'python3 scraper.py' first.")
-        return
-
-    if not jobs:
-        print("No jobs in database yet.")
-        return
-
-    # Get jobs from last 24 hours
-    cutoff = datetime.now() - timedelta(hours=24)
-    new_jobs = []
-
-    for job in jobs:
-        try:
-            scraped_at = datetime.fromisoformat(job['scraped_at'])
-            if scraped_at > cutoff:
-                new_jobs.append(job)
-        except (ValueError, KeyError):
-            continue
+        if not store.exists():
+            print("No jobs found. Run 'python3 scraper.py' first.")
+            return
+
+        # Get jobs from last 24 hours
+        cutoff = datetime.now() - timedelta(hours=24)
+        new_jobs = store.jobs_since(cutoff)
+        if not new_jobs and not store.count():
+            print("No jobs in database yet.")
+            return
+    finally:
+        store.close()
 
     # Display results
     print("=" * 70)
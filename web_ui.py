@@ -15,15 +15,21 @@ import threading
 import subprocess
 import sys
 
+from description_store import open_descriptions
+from http_session import create_session
+from job_store import open_store
+
 app = Flask(__name__)
 app.secret_key = 'dailyscraper-secret-key-change-in-production'
 
 # Get the directory where this script is located
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_PATH = os.path.join(BASE_DIR, 'config.json')
-JOBS_PATH = os.path.join(BASE_DIR, 'jobs.json')
 SCRAPER_PATH = os.path.join(BASE_DIR, 'scraper.py')
 
+# Pooled session so repeated auto-detects against the same host reuse connections
+http_session = create_session()
+
 # Global state for scraping status
 scraping_status = {
     'running': False,
@@ -48,22 +54,27 @@ def save_config(config):
         json.dump(config, f, indent=2)
 
 
+def open_jobs_store():
+    """Job store configured in config.json (see job_store.open_store)"""
+    return open_store(load_config().get('settings', {}), BASE_DIR)
+
+
 def load_jobs():
-    """Load jobs from jobs.json"""
+    """Load every stored job, marking the new ones"""
+    store = open_jobs_store()
     try:
-        with open(JOBS_PATH, 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
+        jobs = store.all_jobs()
+        mark_new_jobs(jobs, store)
+        return jobs
+    finally:
+        store.close()
 
 
-def is_new_job(job, hours=24):
-    """Check if a job was scraped within the last N hours"""
-    try:
-        scraped_at = datetime.fromisoformat(job.get('scraped_at', ''))
-        return datetime.now() - scraped_at < timedelta(hours=hours)
-    except (ValueError, TypeError):
-        return False
+def mark_new_jobs(jobs, store, hours=24):
+    """Set is_new on the jobs scraped within the last N hours (the store only reads its newest jobs)"""
+    new_ids = {job['id'] for job in store.jobs_since(datetime.now() - timedelta(hours=hours))}
+    for job in jobs:
+        job['is_new'] = job.get('id') in new_ids
 
 
 def group_jobs_by_source(jobs):
@@ -89,10 +100,7 @@ def auto_detect_selectors(url):
     """
     try:
         # Fetch the page
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_session.get(url, timeout=10)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.text, 'lxml')
@@ -218,9 +226,9 @@ def run_scraper_background():
         scraping_status['running'] = True
         scraping_status['error'] = None
 
-        # Run scraper as subprocess to capture output
+        # Run scraper as subprocess to capture output (a manual run scrapes every board)
         result = subprocess.run(
-            [sys.executable, SCRAPER_PATH],
+            [sys.executable, SCRAPER_PATH, '--all'],
             cwd=BASE_DIR,
             capture_output=True,
             text=True,
@@ -282,14 +290,9 @@ def index():
 
     # Calculate stats
     total_jobs = len(jobs)
-    new_jobs_count = sum(1 for job in jobs if is_new_job(job))
+    new_jobs_count = sum(1 for job in jobs if job['is_new'])
     active_boards = sum(1 for board in config.get('job_boards', []) if board.get('enabled', True))
 
-    # Mark new jobs
-    for source_jobs in grouped_jobs.values():
-        for job in source_jobs:
-            job['is_new'] = is_new_job(job)
-
     return render_template('dashboard.html',
                          job_boards=config.get('job_boards', []),
                          grouped_jobs=grouped_jobs,
@@ -419,10 +422,6 @@ def all_jobs():
     """View all jobs"""
     jobs = load_jobs()
 
-    # Mark new jobs
-    for job in jobs:
-        job['is_new'] = is_new_job(job)
-
     # Sort by scraped_at (newest first)
     jobs.sort(key=lambda x: x.get('scraped_at', ''), reverse=True)
 
@@ -432,12 +431,12 @@ def all_jobs():
 @app.route('/jobs/<source>')
 def jobs_by_source(source):
     """View jobs for a specific source"""
-    jobs = load_jobs()
-    filtered_jobs = [job for job in jobs if job.get('source') == source]
-
-    # Mark new jobs
-    for job in filtered_jobs:
-        job['is_new'] = is_new_job(job)
+    store = open_jobs_store()
+    try:
+        filtered_jobs = store.by_source(source)
+        mark_new_jobs(filtered_jobs, store)
+    finally:
+        store.close()
 
     # Sort by scraped_at (newest first)
     filtered_jobs.sort(key=lambda x: x.get('scraped_at', ''), reverse=True)
@@ -445,15 +444,30 @@ def jobs_by_source(source):
     return render_template('jobs.html', jobs=filtered_jobs, source=source)
 
 
+@app.route('/api/descriptions/<ref>')
+def api_description(ref):
+    """Full description of a job, fetched when it is expanded"""
+    descriptions = open_descriptions(load_config().get('settings', {}), BASE_DIR)
+    description = descriptions.get(ref) if descriptions is not None else None
+    if description is None:
+        return jsonify({'error': 'Description not found'}), 404
+    return jsonify({'description': description})
+
+
 @app.route('/api/stats')
 def api_stats():
     """API endpoint for stats"""
     config = load_config()
-    jobs = load_jobs()
+    store = open_store(config.get('settings', {}), BASE_DIR)
+    try:
+        total_jobs = store.count()
+        new_jobs = store.count_since(datetime.now() - timedelta(hours=24))
+    finally:
+        store.close()
 
     return jsonify({
-        'total_jobs': len(jobs),
-        'new_jobs': sum(1 for job in jobs if is_new_job(job)),
+        'total_jobs': total_jobs,
+        'new_jobs': new_jobs,
         'active_boards': sum(1 for board in config.get('job_boards', []) if board.get('enabled', True)),
         'total_boards': len(config.get('job_boards', []))
     })